@@ -0,0 +1,2075 @@
+from copy import deepcopy
+from multiprocessing import Pool, shared_memory
+import json
+import numpy as np
+import random
+import re
+import weakref
+
+
+def changed_cells(before, after):
+    flat = np.flatnonzero(before != after)
+    changes = np.empty((flat.size, 2), dtype=np.intp)
+    np.divmod(flat, before.shape[1], out=(changes[:, 0], changes[:, 1]))
+    return changes
+
+
+def compact(values):
+    array = np.asarray(values)
+    if not array.size:
+        return array.astype(np.int8)
+    low, high = int(array.min()), int(array.max())
+    for dtype in (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32, np.int64):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return array.astype(dtype, copy=False)
+    return array
+
+
+def cell_array(cells):
+    return np.array(sorted(cells), dtype=np.int64).reshape(-1, 2)
+
+
+def cell_set(array):
+    return set(map(tuple, array.tolist()))
+
+
+checkpoint_magic = b"CACHKPT1"
+
+
+def aligned(size):
+    return -(-size // 64) * 64
+
+
+def write_checkpoint(path, kind, params, arrays):
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += aligned(array.nbytes)
+    header = json.dumps({"kind": kind, "params": params, "arrays": layout}).encode()
+    start = aligned(len(checkpoint_magic) + 8 + len(header))
+
+    with open(path, "wb") as file:
+        file.write(checkpoint_magic)
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(start + layout[name]["offset"])
+            array.tofile(file)
+        file.truncate(start + offset)
+
+
+def read_checkpoint(path):
+    with open(path, "rb") as file:
+        if file.read(len(checkpoint_magic)) != checkpoint_magic:
+            raise ValueError(f"{path} is not an automaton checkpoint")
+        size = int.from_bytes(file.read(8), "little")
+        header = json.loads(file.read(size))
+    start = aligned(len(checkpoint_magic) + 8 + size)
+
+    # grids are mapped copy-on-write, so they page in as they are touched and stepping never writes the file
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        shape = tuple(spec["shape"])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=spec["dtype"])
+        else:
+            arrays[name] = np.memmap(path, dtype=spec["dtype"], mode="c", offset=start + spec["offset"], shape=shape)
+    return header["kind"], header["params"], arrays
+
+
+class Checkpoint:
+    kinds = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Checkpoint.kinds[cls.__name__] = cls
+
+    def save(self, path):
+        params, arrays = self.checkpoint()
+        write_checkpoint(path, type(self).__name__, params, arrays)
+
+    @classmethod
+    def load(cls, path):
+        kind, params, arrays = read_checkpoint(path)
+        if cls is not Checkpoint and kind != cls.__name__:
+            raise ValueError(f"{path} holds a {kind}, not a {cls.__name__}")
+        system = Checkpoint.kinds[kind].__new__(Checkpoint.kinds[kind])
+        system.restore(params, arrays)
+        return system
+
+
+def sine_transform(a, axis):
+    n = a.shape[axis]
+    a = np.moveaxis(a, axis, -1)
+    zero = np.zeros(a.shape[:-1] + (1,))
+    odd = np.concatenate((zero, a, zero, -a[..., ::-1]), axis=-1)
+    return np.moveaxis(-np.fft.rfft(odd, axis=-1)[..., 1:n + 1].imag, -1, axis)
+
+
+def poisson_solve(rhs):
+    # solves laplacian(u) = rhs with u = 0 just outside the grid
+    h, w = rhs.shape
+    eigen = (2 * np.cos(np.pi * np.arange(1, h + 1) / (h + 1)) - 2)[:, None] + \
+        (2 * np.cos(np.pi * np.arange(1, w + 1) / (w + 1)) - 2)[None, :]
+    coeffs = sine_transform(sine_transform(rhs, 0), 1) / eigen
+    return sine_transform(sine_transform(coeffs, 0), 1) / (4 * (h + 1) * (w + 1))
+
+
+def laplacian(u):
+    p = np.zeros((u.shape[0] + 2, u.shape[1] + 2), dtype=u.dtype)
+    p[1:-1, 1:-1] = u
+    return p[:-2, 1:-1] + p[2:, 1:-1] + p[1:-1, :-2] + p[1:-1, 2:] - 4 * u
+
+
+def topple_grid(padded, odometer):
+    core = padded[1:-1, 1:-1]
+    grains = np.empty_like(core)
+    sweeps = 0
+    while True:
+        np.maximum(core, 0, out=grains)
+        grains >>= 2
+        if not grains.any():
+            return sweeps
+        sweeps += 1
+        odometer += grains
+        core -= grains << 2
+        padded[:-2, 1:-1] += grains
+        padded[2:, 1:-1] += grains
+        padded[1:-1, :-2] += grains
+        padded[1:-1, 2:] += grains
+        padded[0] = padded[-1] = 0
+        padded[:, 0] = padded[:, -1] = 0
+
+
+def settle_grid(padded, odometer):
+    # least action principle: a toppling count that leaves the grid stable and has no set of cells
+    # that could all topple once less is the true odometer, however it was reached
+    core = padded[1:-1, 1:-1]
+    sweeps = 0
+    while True:
+        sweeps += topple_grid(padded, odometer)
+        excess = odometer > 0
+        inside = np.zeros_like(padded)
+        while True:
+            inside[1:-1, 1:-1] = excess
+            needed = excess & (core >= inside[:-2, 1:-1] + inside[2:, 1:-1] + inside[1:-1, :-2] + inside[1:-1, 2:])
+            if not needed.any():
+                break
+            excess &= ~needed
+        if not excess.any():
+            return sweeps
+        odometer -= excess
+        core -= laplacian(excess.astype(odometer.dtype))
+
+
+def relax_grid(grid, settle, margin):
+    h, w = grid.shape
+    padded = np.zeros((h + 2, w + 2), dtype=grid.dtype)
+    core = padded[1:-1, 1:-1]
+    if h * w <= 4096:
+        core[:] = grid
+        odometer = np.zeros_like(grid)
+        sweeps = topple_grid(padded, odometer)
+        return core.copy(), odometer, sweeps, np.zeros(grid.shape)
+
+    # guess the odometer from the stable state of a half resolution copy, then settle it from there
+    hc, wc = (h + 1) // 2, (w + 1) // 2
+    blocks = np.zeros((2 * hc, 2 * wc), dtype=grid.dtype)
+    blocks[:h, :w] = grid
+    coarse, _, _, miss = relax_grid(blocks.reshape(hc, 2, wc, 2).sum(axis=(1, 3)) // 4, settle, margin)
+    guess = poisson_solve(np.kron(coarse, np.ones((2, 2)))[:h, :w] - grid)
+    # a pile twice the size topples about four times as often, and the same guess made for the half resolution copy
+    # missed by about a quarter of what this one will, in the same places
+    expected = 4 * np.kron(miss, np.ones((2, 2)))[:h, :w]
+    # the settling starts a margin under the guess, as far as the settle function prefers toppling to giving back
+    odometer = np.floor(guess - expected).astype(grid.dtype) - int(margin * max(expected.max(), 0) + 8)
+    np.maximum(odometer, 0, out=odometer)
+    core[:] = grid + laplacian(odometer)
+    sweeps = settle(padded, odometer)
+    return core.copy(), odometer, sweeps, guess - odometer
+
+
+shared_arrays = {}
+
+
+def attach_arrays(specs):
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        shared_arrays[key] = block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def step_strip(first, last, step, keys, params):
+    return step(first, last, *(shared_arrays[key][1] for key in keys), *params)
+
+
+def release_blocks(holder, blocks):
+    # the pool is only started by the first run, so it is looked up when the owner goes rather than captured
+    if holder[0] is not None:
+        holder[0].terminate()
+    for block in blocks:
+        block.unlink()
+
+
+class StripPool:
+    def __init__(self, workers, rows):
+        bounds = [rows * k // max(workers, 1) for k in range(max(workers, 1) + 1)]
+        self.strips = [(first, last) for first, last in zip(bounds, bounds[1:]) if first < last] or [(0, rows)]
+        self.holder = [None]
+        self.blocks, self.arrays, self.specs = [], {}, {}
+
+    @property
+    def pool(self):
+        return self.holder[0]
+
+    def share(self, *arrays):
+        if len(self.strips) < 2:
+            return arrays
+        if not self.blocks:
+            # registered with the first block, so a grid that is never stepped is still unlinked
+            weakref.finalize(self, release_blocks, self.holder, self.blocks)
+        shared = []
+        for array in arrays:
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            copy = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            copy[...] = array
+            self.specs[len(self.blocks)] = block.name, array.shape, array.dtype.str
+            self.arrays[id(copy)] = len(self.blocks), copy
+            self.blocks.append(block)
+            shared.append(copy)
+        return shared
+
+    def run(self, step, arrays, *params):
+        if len(self.strips) < 2:
+            return step(*self.strips[0], *arrays, *params)
+        if self.pool is None:
+            self.holder[0] = Pool(len(self.strips), attach_arrays, (self.specs,))
+        # every worker steps its own band of rows, reading the halo rows straight out of the shared source
+        # buffers; the map returning is the barrier between generations
+        keys = [self.arrays[id(array)][0] for array in arrays]
+        return np.concatenate(self.pool.starmap(step_strip, [(first, last, step, keys, params)
+                                                             for first, last in self.strips]))
+
+
+def stabilize_grid(grid, settle=settle_grid, margin=0.5):
+    dtype = np.int32 if grid.sum() < 2 ** 24 else np.int64
+    stable, odometer, sweeps, _ = relax_grid(grid.astype(dtype), settle, margin)
+    return stable, odometer, sweeps
+
+
+class SandPiles(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Sand Piles"
+
+    def __init__(self, dims, rand=0, bulk=False):
+        self.dims = dims  # width, height
+        self.matrix = [[0 for _ in range(self.dims[0])]
+                       for _ in range(self.dims[1])]
+        self.changes = set()
+        self.bulk = bulk
+        # used as an ordered set, so a restored checkpoint topples in the same order
+        self.unstable = {}
+
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 1000)
+            self.matrix[a][b] = c
+            if c > 3:
+                self.unstable[a, b] = None
+
+    color_rules = {
+        0: (0, 0, 0),
+        1: (0.25, 0.25, 0.25),
+        2: (0.5, 0.5, 0.5),
+        3: (0.75, 0.75, 0.75),
+        4: (1, 1, 1),
+    }
+
+    def color(self, i, j):
+        return self.color_rules[min((4, self.matrix[i][j]))]
+
+    def update(self):
+        if self.bulk:
+            self.topple()
+            return
+
+        self.changes.clear()
+        for i in range(self.dims[1]):
+            for j in range(self.dims[0]):
+                if self.matrix[i][j] > 3:
+                    self.matrix[i][j] -= 4
+                    self.changes.add((i, j))
+                    if i != 0:
+                        self.changes.add((i - 1, j))
+                        self.matrix[i - 1][j] += 1
+                    if j != 0:
+                        self.changes.add((i, j - 1))
+                        self.matrix[i][j - 1] += 1
+                    if i != self.dims[1] - 1:
+                        self.changes.add((i + 1, j))
+                        self.matrix[i + 1][j] += 1
+                    if j != self.dims[0] - 1:
+                        self.changes.add((i, j + 1))
+                        self.matrix[i][j + 1] += 1
+
+    def topple(self):
+        self.changes.clear()
+        unstable, self.unstable = self.unstable, {}
+        topplings = 0
+        for i, j in unstable:
+            grains = self.matrix[i][j] // 4
+            if not grains:
+                continue
+            topplings += grains
+            self.matrix[i][j] -= grains * 4
+            self.changes.add((i, j))
+            for x, y in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1)):
+                if -1 < x < self.dims[1] and -1 < y < self.dims[0]:
+                    self.matrix[x][y] += grains
+                    self.changes.add((x, y))
+                    if self.matrix[x][y] > 3:
+                        self.unstable[x, y] = None
+        return topplings
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "bulk": self.bulk}
+        unstable = np.array(list(self.unstable), dtype=np.int64).reshape(-1, 2)
+        return params, {"matrix": compact(self.matrix), "unstable": unstable}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), 0, params["bulk"])
+        self.matrix = arrays["matrix"].tolist()
+        self.unstable = dict.fromkeys(map(tuple, arrays["unstable"].tolist()))
+
+    # each toppling given back costs the settle function a sweep of the whole grid, so it starts well under its guess
+    margin = 0.5
+
+    @staticmethod
+    def settle(padded, odometer):
+        return settle_grid(padded, odometer)
+
+    def stabilize(self):
+        before = np.array(self.matrix, dtype=np.int64)
+        after, odometer, sweeps = stabilize_grid(before, self.settle, self.margin)
+        self.matrix = after.tolist()
+        self.unstable.clear()
+        self.changes = set(map(tuple, changed_cells(before, after).tolist()))
+        return int(odometer.sum()), sweeps
+
+
+boundaries = ("dead", "toroidal", "reflective")
+
+
+def check_boundary(boundary):
+    if boundary not in boundaries:
+        raise ValueError(f"unknown boundary {boundary!r}, expected one of {', '.join(boundaries)}")
+    return boundary
+
+
+def fill_border(grid, boundary):
+    # grids carry one ghost cell all round: dead ghosts stay as they were made, toroidal ones copy the opposite edge
+    # and reflective ones the edge itself; rows go first so the columns carry the corners
+    if boundary == "dead":
+        return
+    top, bottom = (-2, 1) if boundary == "toroidal" else (1, -2)
+    grid[0][:], grid[-1][:] = grid[top], grid[bottom]
+    if isinstance(grid, np.ndarray):
+        grid[:, 0], grid[:, -1] = grid[:, top], grid[:, bottom]
+    else:
+        for row in grid:
+            row[0], row[-1] = row[top], row[bottom]
+
+
+def padded(matrix, boundary):
+    # a copy of a list grid inside a ghost border, so neighbours are read without any bounds checks; copying the
+    # rows costs far less than the generation that reads them
+    width = len(matrix[0]) + 2
+    cells = [[0] * width] + [[0] + row + [0] for row in matrix] + [[0] * width]
+    fill_border(cells, boundary)
+    return cells
+
+
+def mirrors(k, size, boundary):
+    # row (or column) k of a padded grid and the ghost rows that fill_border copies from it
+    if boundary == "dead":
+        return (k,)
+    top, bottom = (size - 2, 1) if boundary == "toroidal" else (1, size - 2)
+    return (k,) + ((0,) if k == top else ()) + ((size - 1,) if k == bottom else ())
+
+
+def write_padded(cells, i, j, value, boundary):
+    # writes matrix[i][j] into a grid from padded() along with every ghost cell that copies it
+    rows, cols = mirrors(i + 1, len(cells), boundary), mirrors(j + 1, len(cells[0]), boundary)
+    for r in rows:
+        row = cells[r]
+        for c in cols:
+            row[c] = value
+
+
+def halo(cells, first, last, boundary):
+    # the rows just outside a band come from the bands next to it, or from the boundary at the grid's edges
+    h = len(cells)
+    edges = {"toroidal": (h - 1, 0), "reflective": (0, h - 1)}.get(boundary)
+    above = cells[first - 1] if first else None if edges is None else cells[edges[0]]
+    below = cells[last] if last < h else None if edges is None else cells[edges[1]]
+    return above, below
+
+
+def neighbour_readers(cells, dims, boundary):
+    readers = set()
+    toroidal = boundary == "toroidal"
+    for i, j in cells:
+        for x in (-1, 0, 1):
+            for y in (-1, 0, 1):
+                a, b = i - x, j - y
+                if toroidal:
+                    readers.add((a % dims[1], b % dims[0]))
+                elif -1 < a < dims[1] and -1 < b < dims[0]:
+                    readers.add((a, b))
+    return readers
+
+
+class GameOfLife(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Game of Life"
+
+    def __init__(self, dims, rand=0, sparse=False, boundary="dead"):
+        self.dims = dims  # width, height
+        self.boundary = check_boundary(boundary)
+        self.matrix = [[0 for _ in range(self.dims[0])]
+                       for _ in range(self.dims[1])]
+        # cells[i + 1][j + 1] holds matrix[i][j] as the generation being stepped began, inside a ghost border; the
+        # sparse path keeps it between generations, so a sparse grid edited by hand needs frontier set back to None
+        self.cells = None
+        self.neighs = ((-1, -1), (-1, 0), (-1, 1), (0, -1),
+                       (0, 1), (1, -1), (1, 0), (1, 1))
+        self.changes = set()
+        self.sparse = sparse
+        self.frontier = None
+
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 1)
+            self.matrix[a][b] = c
+
+    color_rules = {
+        0: (0, 0, 0),
+        1: (1, 1, 1),
+    }
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i][j]]
+
+    def neighbourhood(self, i, j):
+        cells = self.cells
+        count = 0
+        for x, y in self.neighs:
+            count += cells[i + 1 + x][j + 1 + y]
+        if cells[i + 1][j + 1]:
+            return count < 2 or count > 3
+        else:
+            return count == 3
+
+    def frontier_cells(self):
+        if self.frontier is None:
+            return [(i, j) for i in range(self.dims[1]) for j in range(self.dims[0])]
+        return self.frontier
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "sparse": self.sparse, "boundary": self.boundary,
+                  "frontier": self.frontier is not None}
+        return params, {"matrix": compact(self.matrix), "frontier": cell_array(self.frontier or ())}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), 0, params["sparse"], params["boundary"])
+        self.matrix = arrays["matrix"].tolist()
+        self.frontier = cell_set(arrays["frontier"]) if params["frontier"] else None
+
+    def update(self):
+        if self.sparse:
+            self.update_frontier()
+            return
+
+        self.changes.clear()
+        self.cells = padded(self.matrix, self.boundary)
+        for i in range(self.dims[1]):
+            for j in range(self.dims[0]):
+                if self.neighbourhood(i, j):
+                    self.matrix[i][j] = 1 if not self.cells[i + 1][j + 1] else 0
+                    self.changes.add((i, j))
+
+    def update_frontier(self):
+        # the padded grid is built once and then kept in step cell by cell, so a generation costs what changes in it
+        if self.cells is None or self.frontier is None:
+            self.cells = padded(self.matrix, self.boundary)
+        flips = [(i, j) for i, j in self.frontier_cells() if self.neighbourhood(i, j)]
+        self.changes.clear()
+        for i, j in flips:
+            state = 1 if not self.matrix[i][j] else 0
+            self.matrix[i][j] = state
+            write_padded(self.cells, i, j, state, self.boundary)
+            self.changes.add((i, j))
+        self.frontier = neighbour_readers(self.changes, self.dims, self.boundary)
+
+
+class BriansBrain(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Brian's Brain"
+
+    def __init__(self, dims, rand=0, sparse=False, boundary="dead"):
+        self.dims = dims  # width, height
+        self.boundary = check_boundary(boundary)
+        self.matrix = [[0 for _ in range(self.dims[0])]
+                       for _ in range(self.dims[1])]
+        # cells[i + 1][j + 1] holds matrix[i][j] as the generation being stepped began, inside a ghost border; the
+        # sparse path keeps it between generations, so a sparse grid edited by hand needs frontier set back to None
+        self.cells = None
+        self.neighs = ((-1, -1), (-1, 0), (-1, 1), (0, -1),
+                       (0, 1), (1, -1), (1, 0), (1, 1))
+        self.changes = set()
+        self.sparse = sparse
+        self.frontier = None
+
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 2)
+            self.matrix[a][b] = c
+
+    color_rules = {
+        0: (0, 0, 0),
+        1: (0, 0, 1),
+        2: (1, 1, 1)
+    }
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i][j]]
+
+    def neighbourhood(self, i, j):
+        cells = self.cells
+        count = 0
+        for x, y in self.neighs:
+            count += cells[i + 1 + x][j + 1 + y] == 2
+        return count == 2
+
+    def frontier_cells(self):
+        if self.frontier is None:
+            return [(i, j) for i in range(self.dims[1]) for j in range(self.dims[0])]
+        return self.frontier
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "sparse": self.sparse, "boundary": self.boundary,
+                  "frontier": self.frontier is not None}
+        return params, {"matrix": compact(self.matrix), "frontier": cell_array(self.frontier or ())}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), 0, params["sparse"], params["boundary"])
+        self.matrix = arrays["matrix"].tolist()
+        self.frontier = cell_set(arrays["frontier"]) if params["frontier"] else None
+
+    def update(self):
+        if self.sparse:
+            self.update_frontier()
+            return
+
+        self.changes.clear()
+        self.cells = padded(self.matrix, self.boundary)
+        for i in range(self.dims[1]):
+            for j in range(self.dims[0]):
+                state = self.cells[i + 1][j + 1]
+                if state == 0:
+                    if self.neighbourhood(i, j):
+                        self.matrix[i][j] = 2
+                        self.changes.add((i, j))
+                else:
+                    self.matrix[i][j] = state - 1
+                    self.changes.add((i, j))
+
+    def update_frontier(self):
+        if self.cells is None or self.frontier is None:
+            self.cells = padded(self.matrix, self.boundary)
+        states = []
+        for i, j in self.frontier_cells():
+            state = self.cells[i + 1][j + 1]
+            if state == 0:
+                if self.neighbourhood(i, j):
+                    states.append((i, j, 2))
+            else:
+                states.append((i, j, state - 1))
+        self.changes.clear()
+        for i, j, state in states:
+            self.matrix[i][j] = state
+            write_padded(self.cells, i, j, state, self.boundary)
+            self.changes.add((i, j))
+        self.frontier = neighbour_readers(self.changes, self.dims, self.boundary)
+
+
+class NeighbourCounter:
+    cache = {}
+
+    @classmethod
+    def sized(cls, dims):
+        # the scratch buffers are reused from generation to generation, per process
+        if dims not in cls.cache:
+            if len(cls.cache) > 8:
+                cls.cache.clear()
+            cls.cache[dims] = cls(dims)
+        return cls.cache[dims]
+
+    def __init__(self, dims):
+        self.dims = dims  # width, height
+        self.padded = np.zeros((self.dims[1] + 2, self.dims[0] + 2), dtype=np.uint8)
+        self.rows = np.zeros((self.dims[1], self.dims[0] + 2), dtype=np.uint8)
+        self.counts = np.zeros((self.dims[1], self.dims[0]), dtype=np.uint8)
+
+    def count(self, cells, above=None, below=None, boundary="dead"):
+        h, w = self.dims[1], self.dims[0]
+        p = self.padded
+        p[1:h + 1, 1:w + 1] = cells
+        # missing rows are dead; the columns past the edges follow the boundary, corners included
+        p[0, 1:w + 1] = 0 if above is None else above
+        p[h + 1, 1:w + 1] = 0 if below is None else below
+        if boundary == "dead":
+            p[:, 0] = p[:, w + 1] = 0
+        else:
+            left, right = (w, 1) if boundary == "toroidal" else (1, w)
+            p[:, 0], p[:, w + 1] = p[:, left], p[:, right]
+
+        np.add(p[0:h], p[1:h + 1], out=self.rows)
+        self.rows += p[2:h + 2]
+        np.add(self.rows[:, 0:w], self.rows[:, 1:w + 1], out=self.counts)
+        self.counts += self.rows[:, 2:w + 2]
+        self.counts -= cells
+        return self.counts
+
+
+class NumpyGameOfLife(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Game of Life"
+
+    def __init__(self, dims, rand=0, workers=1, boundary="dead"):
+        self.dims = dims  # width, height
+        self.boundary = check_boundary(boundary)
+        self.matrix = np.zeros((self.dims[1], self.dims[0]), dtype=np.uint8)
+        self.buffer = np.zeros_like(self.matrix)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 1)
+            self.matrix[a, b] = c
+        self.strips = StripPool(workers, self.dims[1])
+        self.matrix, self.buffer = self.strips.share(self.matrix, self.buffer)
+
+    color_rules = GameOfLife.color_rules
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i, j]]
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "workers": len(self.strips.strips), "boundary": self.boundary}
+        return params, {"matrix": self.matrix}
+
+    def restore(self, params, arrays):
+        self.dims, self.boundary = tuple(params["dims"]), params["boundary"]
+        self.changes = np.empty((0, 2), dtype=np.intp)
+        self.strips = StripPool(params["workers"], self.dims[1])
+        self.matrix, self.buffer = self.strips.share(arrays["matrix"], np.zeros(arrays["matrix"].shape, dtype=np.uint8))
+
+    @staticmethod
+    def step_rows(first, last, cells, out, boundary):
+        block, target = cells[first:last], out[first:last]
+        above, below = halo(cells, first, last, boundary)
+        counts = NeighbourCounter.sized((cells.shape[1], last - first)).count(block, above, below, boundary)
+        # a cell is alive next generation exactly when (count | alive) == 3
+        np.bitwise_or(counts, block, out=target)
+        np.equal(target, 3, out=target)
+        changes = changed_cells(block, target)
+        changes[:, 0] += first
+        return changes
+
+    def update(self):
+        self.changes = self.strips.run(self.step_rows, (self.matrix, self.buffer), self.boundary)
+        self.matrix, self.buffer = self.buffer, self.matrix
+
+
+class PackedCells:
+    # a row of words holds column j in bit j % 64 of word j // 64; reads and writes index it like a uint8 matrix
+    # with integers, slices and index arrays, unpacking only the cells asked for
+    def __init__(self, words, width):
+        self.words = words
+        self.shape = (len(words), width)
+        self.dtype = np.dtype(np.uint8)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def copy(self):
+        return PackedCells(self.words.copy(), self.shape[1])
+
+    def __array__(self, dtype=None, copy=None):
+        cells = self[:, :]
+        return cells if dtype is None else cells.astype(dtype)
+
+    def split(self, index):
+        # a single index picks whole rows, as it does for a NumPy matrix
+        if not isinstance(index, tuple):
+            index = (index,)
+        if len(index) == 1:
+            index += (slice(None),)
+        if len(index) != 2:
+            raise IndexError(f"too many indices for a {self.shape[0]}x{self.shape[1]} grid")
+        return index
+
+    def indices(self, index):
+        rows, cols = self.split(index)
+        r, c = np.arange(self.shape[0])[rows], np.arange(self.shape[1])[cols]
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            # a slice next to anything else takes every pairing, rows first; indices alone pair up elementwise
+            r = r.reshape(r.shape + (1,) * c.ndim)
+        return r, c
+
+    def __getitem__(self, index):
+        rows, cols = self.split(index)
+        if isinstance(rows, (int, np.integer)) and isinstance(cols, slice):
+            row = np.arange(self.shape[0])[rows]
+            return self[row:row + 1, cols][0]
+        if isinstance(rows, slice) and isinstance(cols, slice):
+            span = range(*cols.indices(self.shape[1]))
+            if not len(span) or span.step < 0:
+                return self.bits(*self.indices(index))
+            # whole words unpack fastest, so only the ones the columns fall in are unpacked
+            low, high = span.start >> 6, (span[-1] >> 6) + 1
+            cells = np.unpackbits(self.words[rows, low:high].view(np.uint8), axis=1, bitorder="little")
+            return cells[:, span.start - 64 * low:span[-1] + 1 - 64 * low:span.step]
+        return self.bits(*self.indices(index))
+
+    def bits(self, rows, cols):
+        return ((self.words[rows, cols >> 6] >> (cols & 63).astype(np.uint64)) & 1).astype(np.uint8)
+
+    def __setitem__(self, index, values):
+        rows, cols, values = np.broadcast_arrays(*self.indices(index), np.asarray(values))
+        words = (rows * self.words.shape[1] + (cols >> 6)).ravel()
+        bits = np.left_shift(np.uint64(1), (cols & 63).astype(np.uint64)).ravel()
+        flat = self.words.reshape(-1)
+        live = values.ravel() != 0
+        np.bitwise_and.at(flat, words[~live], ~bits[~live])
+        np.bitwise_or.at(flat, words[live], bits[live])
+
+
+def word_cells(words):
+    # the (row, column) of every set bit; the lowest bit left in each word is peeled off a round at a time, which
+    # unlike unpacking the words and searching the bytes has no branch to mispredict on scattered bits
+    flat = np.flatnonzero(words)
+    remaining = words.reshape(-1)[flat]
+    found, offsets = [], []
+    while remaining.size:
+        lowest = remaining & (~remaining + np.uint64(1))
+        found.append(flat)
+        # a lone bit converts to a float exactly, and its exponent is its position
+        offsets.append(np.frexp(lowest.astype(np.float64))[1] - 1)
+        remaining ^= lowest
+        left = remaining != 0
+        remaining, flat = remaining[left], flat[left]
+    changes = np.empty((sum(map(len, found)), 2), dtype=np.intp)
+    if len(changes):
+        np.divmod(np.concatenate(found), words.shape[1], out=(changes[:, 0], changes[:, 1]))
+        changes[:, 1] <<= 6
+        changes[:, 1] += np.concatenate(offsets)
+    return changes
+
+
+class PackedGameOfLife(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Game of Life"
+
+    band = 256  # rows stepped at once, so the word temporaries stay in cache
+
+    def __init__(self, dims, rand=0, workers=1, boundary="dead"):
+        self.dims = dims  # width, height
+        self.boundary = check_boundary(boundary)
+        # one bit per cell, 64 to a word, with a ghost row above and below filled by the boundary; bits past the
+        # last column stay clear
+        self.grid = np.zeros((self.dims[1] + 2, -(-self.dims[0] // 64)), dtype="<u8")
+        self.buffer = np.zeros_like(self.grid)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+
+        # later draws of a cell overwrite earlier ones, as they do in the other engines
+        seeds = {}
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 1)
+            seeds[a, b] = c
+        live = cell_array(cell for cell, state in seeds.items() if state)
+        self.matrix[live[:, 0], live[:, 1]] = 1
+        self.strips = StripPool(workers, self.dims[1])
+        self.grid, self.buffer = self.strips.share(self.grid, self.buffer)
+
+    @property
+    def matrix(self):
+        return PackedCells(self.grid[1:-1], self.dims[0])
+
+    color_rules = GameOfLife.color_rules
+
+    def color(self, i, j):
+        return self.color_rules[int(self.grid[i + 1, j >> 6]) >> (j & 63) & 1]
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "workers": len(self.strips.strips), "boundary": self.boundary}
+        return params, {"words": self.grid[1:-1]}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), 0, params["workers"], params["boundary"])
+        self.grid[1:-1] = arrays["words"]
+
+    @staticmethod
+    def step_rows(first, last, grid, out, boundary, width):
+        last_word, last_bit = (width - 1) >> 6, (width - 1) & 63
+        for start in range(first, last, PackedGameOfLife.band):
+            stop = min(start + PackedGameOfLife.band, last)
+            # grid rows are one down from cell rows, so this is the band with a row either side
+            rows = grid[start:stop + 2]
+            # a cell's west neighbour is the bit below it, carried over from the word before at bit 0
+            west, east = rows << 1, rows >> 1
+            west[:, 1:] |= rows[:, :-1] >> 63
+            east[:, :-1] |= rows[:, 1:] << 63
+            if boundary == "toroidal":
+                west[:, 0] |= rows[:, last_word] >> last_bit & 1
+                east[:, last_word] |= (rows[:, 0] & 1) << last_bit
+            elif boundary == "reflective":
+                west[:, 0] |= rows[:, 0] & 1
+                east[:, last_word] |= rows[:, last_word] & (1 << last_bit)
+
+            # each cell and its two neighbours in a row add up to two bits, and three rows of those to the
+            # three low bits of the count over the whole block of nine: a ripple of full adders, 64 cells a word
+            ones = west ^ rows
+            twos = west & rows
+            twos |= east & ones
+            ones ^= east
+            a0, a1, b0, b1, c0, c1 = ones[:-2], twos[:-2], ones[1:-1], twos[1:-1], ones[2:], twos[2:]
+            s0, k0 = a0 ^ b0, a0 & b0
+            half = a1 ^ b1
+            s1, k1 = half ^ k0, (a1 & b1) | (k0 & half)
+            t0, m0 = s0 ^ c0, s0 & c0
+            half = s1 ^ c1
+            t1, t2 = half ^ m0, k1 ^ ((s1 & c1) | (m0 & half))
+            # the block takes in the cell itself, so 3 is a birth or a survival and 4 only a survival; 8 and 9 only
+            # reach the fourth bit, which leaves the three low ones reading 0 and 1
+            centre = rows[1:-1]
+            target = out[start + 1:stop + 1]
+            np.bitwise_and(t0 & t1, ~t2, out=target)
+            target |= centre & t2 & ~(t0 | t1)
+            target[:, -1] &= ~np.uint64(0) >> np.uint64(63 - last_bit)
+        changes = word_cells(grid[first + 1:last + 1] ^ out[first + 1:last + 1])
+        changes[:, 0] += first
+        return changes
+
+    def update(self):
+        if self.boundary != "dead":
+            top, bottom = (-2, 1) if self.boundary == "toroidal" else (1, -2)
+            self.grid[0], self.grid[-1] = self.grid[top], self.grid[bottom]
+        self.changes = self.strips.run(self.step_rows, (self.grid, self.buffer), self.boundary, self.dims[0])
+        self.grid, self.buffer = self.buffer, self.grid
+
+
+class NumpyBriansBrain(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Brian's Brain"
+
+    def __init__(self, dims, rand=0, workers=1, boundary="dead"):
+        self.dims = dims  # width, height
+        self.boundary = check_boundary(boundary)
+        self.matrix = np.zeros((self.dims[1], self.dims[0]), dtype=np.uint8)
+        self.buffer = np.zeros_like(self.matrix)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 2)
+            self.matrix[a, b] = c
+        self.strips = StripPool(workers, self.dims[1])
+        self.matrix, self.buffer = self.strips.share(self.matrix, self.buffer)
+
+    color_rules = BriansBrain.color_rules
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i, j]]
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "workers": len(self.strips.strips), "boundary": self.boundary}
+        return params, {"matrix": self.matrix}
+
+    def restore(self, params, arrays):
+        self.dims, self.boundary = tuple(params["dims"]), params["boundary"]
+        self.changes = np.empty((0, 2), dtype=np.intp)
+        self.strips = StripPool(params["workers"], self.dims[1])
+        self.matrix, self.buffer = self.strips.share(arrays["matrix"], np.zeros(arrays["matrix"].shape, dtype=np.uint8))
+
+    @staticmethod
+    def step_rows(first, last, cells, out, boundary):
+        block, target = cells[first:last], out[first:last]
+        firing = (block == 2).view(np.uint8)
+        above, below = (None if row is None else row == 2 for row in halo(cells, first, last, boundary))
+        counts = NeighbourCounter.sized((cells.shape[1], last - first)).count(firing, above, below, boundary)
+        resting = block == 0
+        births = resting & (counts == 2)
+        np.subtract(block, ~resting, out=target)
+        target += births.view(np.uint8) << 1
+        changes = changed_cells(block, target)
+        changes[:, 0] += first
+        return changes
+
+    def update(self):
+        self.changes = self.strips.run(self.step_rows, (self.matrix, self.buffer), self.boundary)
+        self.matrix, self.buffer = self.buffer, self.matrix
+
+
+life_rules = {
+    "Life": "B3/S23",
+    "HighLife": "B36/S23",
+    "Day & Night": "B3678/S34678",
+    "Seeds": "B2/S",
+    "Life without Death": "B3/S012345678",
+    "Maze": "B3/S12345",
+    "Replicator": "B1357/S1357",
+    "Brian's Brain": "B2/S/C3",
+    "Star Wars": "B2/S345/C4",
+}
+
+
+def parse_rule(rule):
+    # B3/S23 or B2/S345/C4, or the older survival first 23/3 and 345/2/4
+    text = life_rules.get(rule, rule).upper().replace(" ", "")
+    match = re.fullmatch(r"B([0-8]*)/?S([0-8]*)(?:/C?(\d+))?", text)
+    if match:
+        births, survivals, states = match.groups()
+    else:
+        match = re.fullmatch(r"([0-8]*)/([0-8]*)(?:/(\d+))?", text)
+        if not match:
+            raise ValueError(f"{rule!r} is not a B/S or B/S/C rule")
+        survivals, births, states = match.groups()
+    states = int(states or 2)
+    if not 2 <= states <= 256:
+        raise ValueError(f"{rule!r} needs between 2 and 256 states")
+    return {int(n) for n in births}, {int(n) for n in survivals}, states
+
+
+def count_lookup(table, counts, out):
+    # table has bit k set when k live neighbours give a 1; uint8 shifts by 8 come out 0, so that count is checked apart
+    eight = counts == 8 if table >> 8 else None
+    np.right_shift(np.uint8(table & 0xFF), counts, out=out)
+    out &= 1
+    if eight is not None:
+        out |= eight
+    return out
+
+
+class LifeLike(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Life-like"
+
+    def __init__(self, dims, rule="B3/S23", rand=0, workers=1, boundary="dead"):
+        self.dims = dims  # width, height
+        self.boundary = check_boundary(boundary)
+        self.use_rule(rule)
+        self.matrix = np.zeros((self.dims[1], self.dims[0]), dtype=np.uint8)
+        self.buffer = np.zeros_like(self.matrix)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, self.states - 1)
+            self.matrix[a, b] = c
+        self.strips = StripPool(workers, self.dims[1])
+        self.matrix, self.buffer = self.strips.share(self.matrix, self.buffer)
+
+    def use_rule(self, rule):
+        births, survivals, self.states = parse_rule(rule)
+        self.rule = rule
+        # the rule compiles down to two tables from live neighbour count to a bit, one for births and one for survivals
+        self.births, self.survivals = sum(1 << n for n in births), sum(1 << n for n in survivals)
+        # dying cells fade from blue to black, so two and three state rules look like Life and Brian's Brain
+        self.color_rules = {0: (0, 0, 0), self.states - 1: (1, 1, 1)}
+        for state in range(1, self.states - 1):
+            self.color_rules[state] = (0, 0, state / (self.states - 2))
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i, j]]
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "rule": self.rule, "workers": len(self.strips.strips),
+                  "boundary": self.boundary}
+        return params, {"matrix": self.matrix}
+
+    def restore(self, params, arrays):
+        self.dims, self.boundary = tuple(params["dims"]), params["boundary"]
+        self.use_rule(params["rule"])
+        self.changes = np.empty((0, 2), dtype=np.intp)
+        self.strips = StripPool(params["workers"], self.dims[1])
+        self.matrix, self.buffer = self.strips.share(arrays["matrix"], np.zeros(arrays["matrix"].shape, dtype=np.uint8))
+
+    @staticmethod
+    def step_rows(first, last, cells, out, births, survivals, alive, boundary):
+        block, target = cells[first:last], out[first:last]
+        above, below = halo(cells, first, last, boundary)
+        if alive == 1:
+            firing = block
+        else:
+            firing = (block == alive).view(np.uint8)
+            above, below = (None if row is None else row == alive for row in (above, below))
+        counts = NeighbourCounter.sized((cells.shape[1], last - first)).count(firing, above, below, boundary)
+        kept = count_lookup(survivals, counts, np.empty_like(counts))
+        if alive == 1:
+            count_lookup(births, counts, target)
+            # keep the survival bit where the cell is alive and the birth bit where it is not
+            kept ^= target
+            kept &= block
+            target ^= kept
+        else:
+            # every state other than resting counts down by one, a surviving cell stays at the top and a birth jumps
+            # to it
+            resting = block == 0
+            born = count_lookup(births, counts, counts)
+            born &= resting
+            born *= alive
+            kept &= firing
+            np.subtract(block, ~resting, out=target)
+            target += born
+            target += kept
+        changes = changed_cells(block, target)
+        changes[:, 0] += first
+        return changes
+
+    def update(self):
+        self.changes = self.strips.run(self.step_rows, (self.matrix, self.buffer), self.births, self.survivals,
+                                       self.states - 1, self.boundary)
+        self.matrix, self.buffer = self.buffer, self.matrix
+
+
+def parse_rle(text):
+    cells = set()
+    row = col = 0
+    count = ''
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in '#x':
+            continue
+        for char in line:
+            if char.isdigit():
+                count += char
+                continue
+            run = int(count) if count else 1
+            count = ''
+            if char == 'b':
+                col += run
+            elif char == '$':
+                row += run
+                col = 0
+            elif char == '!':
+                return cells
+            else:
+                for k in range(run):
+                    cells.add((row, col + k))
+                col += run
+    return cells
+
+
+class QuadNode:
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.level = level
+        self.population = population
+
+
+class HashLife(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "HashLife"
+
+    def __init__(self, dims, rand=0, step=1, budget=1 << 20):
+        self.dims = dims  # width, height
+        self.step = step
+        self.budget = budget
+        self.table = {}
+        self.results = {}
+        self.off = QuadNode(None, None, None, None, 0, 0)
+        self.on = QuadNode(None, None, None, None, 0, 1)
+        self.empty = [self.off]
+        self.generation = 0
+        self.view = [0, 0]  # universe row, column of matrix[0][0]
+        self.live = set()
+        self.changes = set()
+
+        cells = {}
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 1)
+            cells[a, b] = c
+        self.set_cells(cell for cell, alive in cells.items() if alive)
+
+    color_rules = GameOfLife.color_rules
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i][j]]
+
+    def checkpoint(self):
+        size = 1 << self.root.level
+        params = {"dims": list(self.dims), "step": self.step, "budget": self.budget, "generation": self.generation,
+                  "view": self.view, "origin": self.origin}
+        return params, {"cells": compact(cell_array(self.live_cells(self.root, 0, 0, (0, size), (0, size))))}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), 0, params["step"], params["budget"])
+        self.generation, self.view = params["generation"], params["view"]
+        top, left = params["origin"]
+        self.set_cells((r + top, c + left) for r, c in arrays["cells"].tolist())
+        self.changes = set()
+
+    def join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self.table.get(key)
+        if node is None:
+            node = QuadNode(nw, ne, sw, se, nw.level + 1,
+                            nw.population + ne.population + sw.population + se.population)
+            self.table[key] = node
+        return node
+
+    def blank(self, level):
+        while len(self.empty) <= level:
+            e = self.empty[-1]
+            self.empty.append(self.join(e, e, e, e))
+        return self.empty[level]
+
+    def set_cells(self, cells):
+        cells = list(cells)
+        self.table.clear()
+        self.results.clear()
+        self.empty = [self.off]
+        if not cells:
+            self.root, self.origin = self.blank(3), [0, 0]
+            self.export()
+            return
+
+        top, left = min(r for r, _ in cells), min(c for _, c in cells)
+        nodes = {(r - top, c - left): self.on for r, c in cells}
+        level = 0
+        while len(nodes) > 1 or level < 3:
+            parents = {}
+            for r, c in {(r >> 1, c >> 1) for r, c in nodes}:
+                e = self.blank(level)
+                parents[r, c] = self.join(nodes.get((2 * r, 2 * c), e), nodes.get((2 * r, 2 * c + 1), e),
+                                          nodes.get((2 * r + 1, 2 * c), e), nodes.get((2 * r + 1, 2 * c + 1), e))
+            nodes = parents
+            level += 1
+        (r, c), self.root = nodes.popitem()
+        self.origin = [top + (r << level), left + (c << level)]
+        self.export()
+
+    def live_cells(self, node, top, left, rows, cols):
+        if not node.population or top >= rows[1] or left >= cols[1]:
+            return
+        size = 1 << node.level
+        if top + size <= rows[0] or left + size <= cols[0]:
+            return
+        if not node.level:
+            yield top, left
+            return
+        half = size >> 1
+        yield from self.live_cells(node.nw, top, left, rows, cols)
+        yield from self.live_cells(node.ne, top, left + half, rows, cols)
+        yield from self.live_cells(node.sw, top + half, left, rows, cols)
+        yield from self.live_cells(node.se, top + half, left + half, rows, cols)
+
+    def export(self):
+        rows = (self.view[0], self.view[0] + self.dims[1])
+        cols = (self.view[1], self.view[1] + self.dims[0])
+        self.matrix = [[0 for _ in range(self.dims[0])]
+                       for _ in range(self.dims[1])]
+        live = set()
+        for r, c in self.live_cells(self.root, self.origin[0], self.origin[1], rows, cols):
+            live.add((r - rows[0], c - cols[0]))
+            self.matrix[r - rows[0]][c - cols[0]] = 1
+        self.changes = live ^ self.live
+        self.live = live
+
+    def collect(self):
+        # keeps the nodes reachable from the root and the memo entries of those nodes, along with whatever those
+        # entries point to, so the next jump starts from the work that is still useful
+        table = {}
+
+        def keep(stack):
+            while stack:
+                node = stack.pop()
+                if node.level and (node.nw, node.ne, node.sw, node.se) not in table:
+                    table[node.nw, node.ne, node.sw, node.se] = node
+                    stack.extend((node.nw, node.ne, node.sw, node.se))
+
+        keep([self.root])
+        live = set(table.values())
+        self.results = {key: result for key, result in self.results.items() if key[0] in live}
+        keep(list(self.results.values()))
+        self.table = table
+        self.empty = [self.off]
+        if len(self.table) > self.budget // 2:
+            # the pattern itself has outgrown the budget, collecting again soon would only throw away live work
+            self.budget = 2 * len(self.table)
+
+    def inner(self, node):
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def expand(self):
+        e = self.blank(self.root.level - 1)
+        r = self.root
+        self.root = self.join(self.join(e, e, e, r.nw), self.join(e, e, r.ne, e),
+                              self.join(e, r.sw, e, e), self.join(r.se, e, e, e))
+        half = 1 << (self.root.level - 2)
+        self.origin = [self.origin[0] - half, self.origin[1] - half]
+
+    def crop(self):
+        while self.root.level > 3 and self.inner(self.root).population == self.root.population:
+            quarter = 1 << (self.root.level - 2)
+            self.root = self.inner(self.root)
+            self.origin = [self.origin[0] + quarter, self.origin[1] + quarter]
+
+    def life_4x4(self, node):
+        cells = [[node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+                 [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+                 [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+                 [node.sw.sw, node.sw.se, node.se.sw, node.se.se]]
+        cells = [[cell.population for cell in row] for row in cells]
+        quad = []
+        for i, j in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            count = sum(cells[i + x][j + y] for x in (-1, 0, 1) for y in (-1, 0, 1)) - cells[i][j]
+            quad.append(self.on if count == 3 or (count == 2 and cells[i][j]) else self.off)
+        return self.join(*quad)
+
+    def successor(self, node, j):
+        # centre half of node, 2 ** j generations on, j is capped at node.level - 2
+        if not node.population:
+            return node.nw
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self.life_4x4(node)
+        else:
+            a, b, c, d = node.nw, node.ne, node.sw, node.se
+            c1 = self.successor(a, j)
+            c2 = self.successor(self.join(a.ne, b.nw, a.se, b.sw), j)
+            c3 = self.successor(b, j)
+            c4 = self.successor(self.join(a.sw, a.se, c.nw, c.ne), j)
+            c5 = self.successor(self.inner(node), j)
+            c6 = self.successor(self.join(b.sw, b.se, d.nw, d.ne), j)
+            c7 = self.successor(c, j)
+            c8 = self.successor(self.join(c.ne, d.nw, c.se, d.sw), j)
+            c9 = self.successor(d, j)
+            if j < node.level - 2:
+                result = self.join(self.join(c1.se, c2.sw, c4.ne, c5.nw), self.join(c2.se, c3.sw, c5.ne, c6.nw),
+                                   self.join(c4.se, c5.sw, c7.ne, c8.nw), self.join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                result = self.join(self.successor(self.join(c1, c2, c4, c5), j),
+                                   self.successor(self.join(c2, c3, c5, c6), j),
+                                   self.successor(self.join(c4, c5, c7, c8), j),
+                                   self.successor(self.join(c5, c6, c8, c9), j))
+        self.results[key] = result
+        return result
+
+    def jump(self, j):
+        # only between jumps, never inside successor, where the nodes being worked on are not yet under the root
+        if len(self.table) > self.budget:
+            self.collect()
+        while self.root.level < j + 2 or self.inner(self.root).population != self.root.population:
+            self.expand()
+        self.expand()
+        quarter = 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, j)
+        self.origin = [self.origin[0] + quarter, self.origin[1] + quarter]
+        self.generation += 1 << j
+        self.crop()
+
+    def advance(self, generations):
+        j = 0
+        while generations:
+            if generations & 1:
+                self.jump(j)
+            generations >>= 1
+            j += 1
+        self.export()
+
+    def update(self):
+        self.advance(self.step)
+
+
+class Elementary(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Elementary"
+
+    def __init__(self, dims, rule, seed=0):
+        self.dims = dims  # width, height
+        self.matrix = [[0 for _ in range(self.dims[0])]
+                       for _ in range(self.dims[1])]
+        self.changes = set()
+
+        self.rule_set = list(map(int, list(bin(rule)[2:].zfill(8))))
+        if seed == 0:
+            self.current = [0 for _ in range(self.dims[0])]
+            if rule % 2 == 0:
+                self.current[self.dims[0] // 2] = 1
+        elif seed == 1:
+            self.current = [random.randint(0, 1) for _ in range(self.dims[0])]
+
+        self.row = self.dims[1] - 1
+
+    color_rules = {
+        0: (0, 0, 0),
+        1: (1, 1, 1),
+    }
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i][j]]
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "rule": int("".join(map(str, self.rule_set)), 2), "row": self.row}
+        return params, {"matrix": compact(self.matrix), "current": compact(self.current)}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), params["rule"])
+        self.matrix = arrays["matrix"].tolist()
+        self.current = arrays["current"].tolist()
+        self.row = params["row"]
+
+    def generation(self):
+        next_gen = deepcopy(self.current)
+        for i in range(1, len(self.current) - 1):
+            index = 7 - int(''.join(map(str, self.current[i - 1:i + 2])), 2)
+            next_gen[i] = self.rule_set[index]
+        return next_gen
+
+    def update(self):
+        self.changes.clear()
+        self.current = self.generation()
+        self.matrix[self.row] = self.current
+        for i in range(self.dims[0]):
+            self.changes.add((self.row, i))
+        # past the bottom the oldest rows are overwritten in place
+        self.row = (self.row - 1) % self.dims[1]
+
+
+class BitElementary(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Elementary"
+
+    def __init__(self, dims, rule, seed=0, batch=1):
+        self.dims = dims  # width, height
+        self.batch = batch  # generations per update
+        # a ring of the last dims[1] generations, written bottom up and overwritten in place once it wraps
+        self.matrix = np.zeros((self.dims[1], self.dims[0]), dtype=np.uint8)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+
+        # bit i holds cell i, so a cell's left neighbour arrives with << 1 and its right one with >> 1
+        rule_set = list(map(int, list(bin(rule)[2:].zfill(8))))
+        self.patterns = [p for p in range(8) if rule_set[7 - p]]
+        self.mask = (1 << self.dims[0]) - 1
+        self.edges = 1 | (1 << (self.dims[0] - 1))
+        if seed == 0:
+            self.bits = 1 << (self.dims[0] // 2) if rule % 2 == 0 else 0
+        elif seed == 1:
+            self.bits = 0
+            for i in range(self.dims[0]):
+                self.bits |= random.randint(0, 1) << i
+
+        self.row = self.dims[1] - 1
+        self.generations = 0
+
+    color_rules = Elementary.color_rules
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i, j]]
+
+    def unpack(self, rows):
+        size = (self.dims[0] + 7) // 8
+        packed = np.frombuffer(b"".join(bits.to_bytes(size, "little") for bits in rows), dtype=np.uint8)
+        return np.unpackbits(packed.reshape(-1, size), axis=1, count=self.dims[0], bitorder="little")
+
+    @property
+    def current(self):
+        return self.unpack([self.bits])[0].tolist()
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "rule": sum(1 << p for p in self.patterns), "batch": self.batch,
+                  "row": self.row, "generations": self.generations}
+        size = (self.dims[0] + 7) // 8
+        return params, {"matrix": self.matrix, "bits": np.frombuffer(self.bits.to_bytes(size, "little"), np.uint8)}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), params["rule"], 0, params["batch"])
+        self.matrix[:] = arrays["matrix"]
+        self.bits = int.from_bytes(arrays["bits"].tobytes(), "little")
+        self.row, self.generations = params["row"], params["generations"]
+
+    def generation(self, centre):
+        left, right = centre << 1, centre >> 1
+        next_gen = 0
+        for p in self.patterns:
+            next_gen |= (left if p & 4 else ~left) & (centre if p & 2 else ~centre) & (right if p & 1 else ~right)
+        return (next_gen & self.mask & ~self.edges) | (centre & self.edges)
+
+    def spacetime(self, count):
+        # count generations as one block: the stepping stays on Python ints, 64 cells a machine word, and the whole
+        # block is unpacked and written into the ring at once
+        rows, bits = [], self.bits
+        for _ in range(count):
+            bits = self.generation(bits)
+            rows.append(bits)
+        self.bits = bits
+        self.generations += count
+        block = self.unpack(rows) if rows else np.empty((0, self.dims[0]), dtype=np.uint8)
+
+        # each generation goes one row below the last, so the ring fills from self.row downwards
+        height = self.dims[1]
+        written = block[-height:]
+        targets = (self.row - (count - len(written)) - np.arange(len(written))) % height
+        self.matrix[targets] = written
+        self.row = (self.row - count) % height
+        return block, targets
+
+    @property
+    def scroll(self):
+        # once the ring is full it is shown from the oldest generation down to the newest at the bottom, so the
+        # diagram scrolls instead of wiping round; before that the rows are shown as written
+        return (self.row + 1) % self.dims[1] if self.generations >= self.dims[1] else 0
+
+    def history(self):
+        # generations in the ring, oldest first
+        filled = min(self.generations, self.dims[1])
+        return self.matrix[(self.row + np.arange(filled, 0, -1)) % self.dims[1]]
+
+    def additive(self):
+        # rules 90 and 150 are sums mod 2 of the neighbourhood, which powers of two turn into plain shifts; with both
+        # edges dead the row is one half of a mirrored ring of 2 * (width - 1) cells that never needs its edges
+        # pinned
+        if self.bits & self.edges or self.dims[0] < 3:
+            return None
+        rule = sum(1 << p for p in self.patterns)
+        return {90: False, 150: True}.get(rule)
+
+    def advance(self, generations):
+        centre = self.additive()
+        if centre is None:
+            bits = self.bits
+            for _ in range(generations):
+                bits = self.generation(bits)
+            self.bits = bits
+        else:
+            w = self.dims[0]
+            length = 2 * (w - 1)
+            full = (1 << length) - 1
+            mirrored = int(bin(self.bits >> 1 & (1 << (w - 2)) - 1)[2:].zfill(w - 2)[::-1], 2)
+            ring = self.bits | mirrored << w
+            k = 0
+            while generations >> k:
+                if generations >> k & 1:
+                    shift = (1 << k) % length
+                    turned = (ring << shift | ring >> (length - shift)) & full
+                    back = (ring >> shift | ring << (length - shift)) & full
+                    ring = turned ^ back ^ (ring if centre else 0)
+                k += 1
+            self.bits = ring & self.mask
+        self.generations += generations
+
+    def jump(self, generation):
+        # skip straight to the given generation, only unpacking the generations that end up in the ring
+        ahead = generation - self.generations
+        if ahead > self.dims[1]:
+            self.advance(ahead - self.dims[1])
+            self.row = (self.row - ahead + self.dims[1]) % self.dims[1]
+            ahead = self.dims[1]
+        self.update_block(max(ahead, 0))
+
+    def update_block(self, count):
+        _, targets = self.spacetime(count)
+        changes = np.empty((len(targets), self.dims[0], 2), dtype=np.intp)
+        changes[:, :, 0] = targets[:, None]
+        changes[:, :, 1] = np.arange(self.dims[0])
+        self.changes = changes.reshape(-1, 2)
+
+    def update(self):
+        self.update_block(self.batch)
+
+
+class RockPaperScissors(Checkpoint):
+    @classmethod
+    def name(cls):
+        return "Rock Paper Scissors"
+
+    neighs = ((-1, -1), (-1, 0), (-1, 1), (0, -1),
+              (0, 1), (1, -1), (1, 0), (1, 1))
+
+    def __init__(self, dims, power=9, rand=0, workers=1, boundary="dead"):
+        if not 0 <= power <= 255:
+            # health is kept in a byte per cell
+            raise ValueError(f"health {power} is not between 0 and 255")
+        self.dims = dims  # width, height
+        self.power = power
+        self.boundary = check_boundary(boundary)
+        h, w = self.dims[1], self.dims[0]
+        # one cell of border all round, empty for a dead boundary and refilled before every step for the others
+        self.species = np.full((h + 2, w + 2), -1, dtype=np.int8)
+        self.health = np.full((h + 2, w + 2), self.power, dtype=np.uint8)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+        for _ in range(rand):
+            a, b, c = random.randint(
+                0, self.dims[1] - 1), random.randint(0, self.dims[0] - 1), random.randint(0, 2)
+            self.species[a + 1, b + 1] = c
+        self.strips = StripPool(workers, h)
+        self.species, self.health, self.spare_species, self.spare_health = self.strips.share(
+            self.species, self.health, self.species.copy(), self.health.copy())
+        self.matrix = self.species[1:h + 1, 1:w + 1]
+
+    color_rules = {
+        -1: (0, 0, 0),
+        0: (1, 0, 0),
+        1: (0, 1, 0),
+        2: (0, 0, 1),
+    }
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i, j]]
+
+    @staticmethod
+    def beats(a, b):
+        return a == (b + 1) % 3
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "power": self.power, "workers": len(self.strips.strips),
+                  "boundary": self.boundary}
+        return params, {"species": self.species, "health": self.health}
+
+    def restore(self, params, arrays):
+        self.dims, self.power, self.boundary = tuple(params["dims"]), params["power"], params["boundary"]
+        h, w = self.dims[1], self.dims[0]
+        self.changes = np.empty((0, 2), dtype=np.intp)
+        # only the border of the spare buffers is ever read before it is written
+        spare_species = np.empty(arrays["species"].shape, dtype=np.int8)
+        spare_health = np.empty(arrays["health"].shape, dtype=np.uint8)
+        for spare, fill in ((spare_species, -1), (spare_health, self.power)):
+            spare[0], spare[-1], spare[:, 0], spare[:, -1] = fill, fill, fill, fill
+        self.strips = StripPool(params["workers"], h)
+        self.species, self.health, self.spare_species, self.spare_health = self.strips.share(
+            arrays["species"], arrays["health"], spare_species, spare_health)
+        self.matrix = self.species[1:h + 1, 1:w + 1]
+
+    @staticmethod
+    def step_rows(first, last, all_species, all_health, all_next_species, all_next_health, power):
+        w = all_species.shape[1] - 2
+        rows, cols = slice(first + 1, last + 1), slice(1, w + 1)
+        species, health = all_species[rows, cols], all_health[rows, cols]
+        next_species, next_health = all_next_species[rows, cols], all_next_health[rows, cols]
+        next_species[:] = species
+        next_health[:] = health
+
+        empty = species < 0
+        hunter = np.where(empty, -2, (species + 1) % 3).astype(np.int8)
+        attacks = np.zeros(species.shape, dtype=np.uint8)
+        # an empty cell takes the species of its last living neighbour in row-major order, so later
+        # directions overwrite earlier ones
+        for x, y in RockPaperScissors.neighs:
+            near = all_species[first + 1 + x:last + 1 + x, 1 + y:w + 1 + y]
+            near_health = all_health[first + 1 + x:last + 1 + x, 1 + y:w + 1 + y]
+            spread = empty & (near >= 0) & (near_health > 0)
+            np.copyto(next_species, near, where=spread)
+            np.copyto(next_health, near_health - 1, where=spread)
+            attacks += near == hunter
+
+        # every attacker wears down a cell's health, one with none left is taken over
+        wounded = np.minimum(attacks, health)
+        next_health -= wounded
+        taken = (attacks > 0) & (health == 0)
+        np.copyto(next_species, hunter, where=taken)
+        next_health[taken] = power
+
+        changes = changed_cells(species, next_species)
+        changes[:, 0] += first
+        return changes
+
+    def update(self):
+        fill_border(self.species, self.boundary)
+        fill_border(self.health, self.boundary)
+        self.changes = self.strips.run(self.step_rows, (self.species, self.health, self.spare_species,
+                                                        self.spare_health), self.power)
+        self.species, self.spare_species = self.spare_species, self.species
+        self.health, self.spare_health = self.spare_health, self.health
+        self.matrix = self.species[1:self.dims[1] + 1, 1:self.dims[0] + 1]
+
+
+class Walker(Checkpoint):
+    max_period = 1024
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "rule": self.rule, "steps": self.steps, "agent": list(self.agent),
+                  "dir": self.dir, "state": self.state, "step_count": self.step_count, "safe": self.safe}
+        return params, {"matrix": compact(self.matrix)}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), params["rule"], params["steps"])
+        self.matrix = arrays["matrix"].tolist()
+        self.agent[:] = params["agent"]
+        self.dir, self.state = params["dir"], params["state"]
+        self.step_count, self.safe = params["step_count"], params["safe"]
+
+    def walk(self, count):
+        matrix, table, moves = self.matrix, self.table, self.moves
+        width, height = self.dims
+        x, y = self.agent
+        direction, state = self.dir, self.state
+        visited = []
+        append = visited.append
+        for _ in range(count):
+            if not (-1 < x < height and -1 < y < width):
+                self.safe = False
+                break
+            append((x, y))
+            row = matrix[x]
+            row[y], turn, state = table[state][row[y]]
+            direction = (direction + turn) & 3
+            dx, dy = moves[direction]
+            x += dx
+            y += dy
+        self.agent[0], self.agent[1] = x, y
+        self.dir, self.state = direction, state
+        self.step_count += len(visited)
+        return visited
+
+    def run_until(self, step_count):
+        self.changes = set()
+        while self.safe and self.step_count < step_count:
+            visited = self.walk(min(step_count - self.step_count, 1 << 16))
+            self.changes.update(visited)
+            if len(visited) >= 4 * self.max_period and step_count - self.step_count > 2 * self.max_period:
+                self.find_highway(visited, step_count)
+        return self.step_count
+
+    def find_highway(self, visited, step_count):
+        trail = np.array(visited[-4 * self.max_period:])
+        periods = np.arange(1, self.max_period + 1)
+        last = trail[-1] - trail[-1 - periods]
+        before = trail[-1 - periods] - trail[-1 - 2 * periods]
+        for period in periods[(last == before).all(axis=1) & last.any(axis=1)]:
+            shift = trail[period:] - trail[:-period]
+            if (shift == shift[0]).all():
+                self.fast_forward(visited[-period:], int(period), shift[0].tolist(), step_count)
+                return
+
+    def fast_forward(self, trail, period, shift, step_count):
+        # the next period should retrace the last one moved by shift, so it has to stay inside this box
+        dx, dy = shift
+        top, bottom = min(x for x, _ in trail) + dx, max(x for x, _ in trail) + dx
+        left, right = min(y for _, y in trail) + dy, max(y for _, y in trail) + dy
+        if not (0 <= min(top, top + dx) and max(bottom, bottom + dx) < self.dims[1] and
+                0 <= min(left, left + dy) and max(right, right + dy) < self.dims[0]):
+            return
+        before = [self.matrix[x][left:right + 1] for x in range(top, bottom + 1)]
+        start = [self.agent[0] + dx, self.agent[1] + dy, self.dir, self.state]
+
+        visited = self.walk(period)
+        self.changes.update(visited)
+        if len(visited) < period or [self.agent[0], self.agent[1], self.dir, self.state] != start or \
+                any(not (top <= x <= bottom and left <= y <= right) for x, y in visited):
+            return
+        after = [self.matrix[x][left:right + 1] for x in range(top, bottom + 1)]
+        if [self.matrix[x + dx][left + dy:right + dy + 1] for x in range(top, bottom + 1)] != before:
+            return
+
+        # each further period replays the last one a shift along, as long as the cells the box moves onto look
+        # like the ones it moved onto last time
+        fresh = [(x, y) for x in range(top + dx, bottom + dx + 1) for y in range(left + dy, right + dy + 1)
+                 if not (top <= x <= bottom and left <= y <= right)]
+        repeats = 0
+        while repeats < (step_count - self.step_count) // period:
+            k = repeats + 1
+            if any(not (-1 < x + k * dx < self.dims[1] and -1 < y + k * dy < self.dims[0]) or
+                   self.matrix[x + k * dx][y + k * dy] != self.matrix[x][y] for x, y in fresh):
+                break
+            repeats = k
+
+        for k in range(1, repeats + 1):
+            for x, values in enumerate(after, top + k * dx):
+                self.matrix[x][left + k * dy:right + k * dy + 1] = values
+            self.changes.update((x + k * dx, y + k * dy) for x, y in visited)
+        self.agent[0] += repeats * dx
+        self.agent[1] += repeats * dy
+        self.step_count += repeats * period
+
+
+class LangtonsAnt(Walker):
+    @classmethod
+    def name(cls):
+        return "Langton's Ant"
+
+    rule_sets = {0: "LR",
+                 1: "LLRR",
+                 2: "LRRL",
+                 3: "RRLLLRLLLRRR",
+                 4: "LRRRRRLLR", }
+
+    def __init__(self, dims, config=0, steps=1):
+        self.dims = dims  # width, height
+        self.matrix = [[0 for _ in range(self.dims[0])]
+                       for _ in range(self.dims[1])]
+        self.changes = set()
+        self.ant = [self.dims[1] // 2, self.dims[0] // 2]  # row, column
+        self.rule = config
+        self.config = self.rule_sets[config]
+        self.states = len(self.config)
+        self.steps = steps
+        self.dir = 0
+        self.state = 0
+        self.step_count = 0
+        self.moves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        self.safe = True
+        self.table = self.transitions(config)
+
+    @classmethod
+    def transitions(cls, config):
+        # indexed by agent state then cell colour: the colour to write, the quarter turns right and the next state
+        rules = cls.rule_sets[config]
+        turns = {"R": 1, "L": 3}
+        return [[((val + 1) % len(rules), turns.get(rule, 0), 0) for val, rule in enumerate(rules)]]
+
+    @property
+    def agent(self):
+        return self.ant
+
+    color_rules = {
+        0: (0, 0, 0),
+        1: (0.1, 0.1, 0.1),
+        2: (0.2, 0.2, 0.2),
+        3: (0.3, 0.3, 0.3),
+        4: (0.4, 0.4, 0.4),
+        5: (0.5, 0.5, 0.5),
+        6: (0.6, 0.6, 0.6),
+        7: (0.7, 0.7, 0.7),
+        8: (0.8, 0.8, 0.8),
+        9: (0.9, 0.9, 0.9),
+        10: (1, 1, 1),
+    }
+
+    def color(self, i, j):
+        # RRLLLRLLLRRR has more states than shades, so the last ones share white
+        return self.color_rules[min(self.matrix[i][j], 10)]
+
+    def update(self):
+        self.changes = set(self.walk(self.steps))
+
+
+class Turmites(Walker):
+    @classmethod
+    def name(cls):
+        return "Turmites"
+
+    rule_sets = {0: [[[1, 2, 0], [1, 2, 1]], [[0, 1, 0], [0, 1, 1]]],
+                 1: [[[1, 1, 1], [1, 8, 0]], [[1, 2, 1], [0, 1, 0]]],
+                 2: [[[1, 2, 1], [0, 2, 1]], [[1, 1, 0], [1, 1, 1]]],
+                 3: [[[1, 2, 1], [1, 8, 1]], [[1, 2, 1], [0, 2, 0]]],
+                 4: [[[1, 8, 0], [1, 2, 1]], [[0, 2, 0], [0, 8, 1]]],
+                 5: [[[1, 8, 1], [1, 8, 1]], [[1, 2, 1], [0, 1, 0]]],
+                 6: [[[0, 1, 1], [0, 2, 1]], [[1, 8, 0], [0, 1, 1]]],
+                 7: [[[1, 8, 1], [1, 2, 0]], [[1, 4, 1], [1, 4, 2]], [[], [0, 4, 0]]], }
+
+    def __init__(self, dims, rule=0, steps=1):
+        self.dims = dims  # width, height
+        self.matrix = [[0 for _ in range(self.dims[0])]
+                       for _ in range(self.dims[1])]
+        self.changes = set()
+        self.moves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        self.turmite = [self.dims[1] // 2, self.dims[0] // 2]  # row, column
+        self.rule = rule
+        self.rule_set = self.rule_sets[rule]
+        self.steps = steps
+        self.dir = 0
+        self.state = 0
+        self.step_count = 0
+        self.safe = True
+        self.table = self.transitions(rule)
+
+    @classmethod
+    def transitions(cls, rule):
+        turns = {2: 1, 4: 2, 8: 3}
+        return [[(entry[0], turns.get(entry[1], 0), entry[2]) if entry else None for entry in state]
+                for state in cls.rule_sets[rule]]
+
+    @property
+    def agent(self):
+        return self.turmite
+
+    color_rules = {
+        0: (0, 0, 0),
+        1: (0.1, 0.1, 0.1),
+        2: (0.2, 0.2, 0.2),
+        3: (0.3, 0.3, 0.3),
+        4: (0.4, 0.4, 0.4),
+        5: (0.5, 0.5, 0.5),
+        6: (0.6, 0.6, 0.6),
+        7: (0.7, 0.7, 0.7),
+        8: (0.8, 0.8, 0.8),
+        9: (0.9, 0.9, 0.9),
+        10: (1, 1, 1),
+    }
+
+    def color(self, i, j):
+        return self.color_rules[self.matrix[i][j]]
+
+    def update(self):
+        self.changes = set(self.walk(self.steps))
+
+
+class Colony(Checkpoint):
+    walker = None
+
+    def __init__(self, dims, rule=0, steps=1, agents=1000, boundary="toroidal"):
+        self.dims = dims  # width, height
+        self.matrix = np.zeros((self.dims[1], self.dims[0]), dtype=np.uint8)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+        self.visited = np.zeros_like(self.matrix, dtype=bool)
+        self.rule = rule
+        self.steps = steps
+        self.boundary = check_boundary(boundary)
+        self.step_count = 0
+        self.moves = np.array([(-1, 0), (0, 1), (1, 0), (0, -1)])
+
+        # one row per agent state and cell colour, so a whole colony looks up its moves in one gather; a turmite
+        # with no entry for a colour leaves the cell alone and carries on as it was
+        table = self.walker.transitions(rule)
+        self.colours = max(len(state) for state in table)
+        self.table = np.array([entry or (colour, 0, state) for state, entries in enumerate(table)
+                               for colour, entry in enumerate(entries + [None] * (self.colours - len(entries)))])
+
+        # the first agent starts where a lone walker would, the rest anywhere facing any way
+        cells = [(self.dims[1] // 2, self.dims[0] // 2, 0)][:agents] + \
+            [(random.randrange(self.dims[1]), random.randrange(self.dims[0]), random.randrange(4))
+             for _ in range(agents - 1)]
+        agents = np.array(cells, dtype=np.intp).reshape(-1, 3)
+        self.rows, self.cols, self.dirs = agents[:, 0].copy(), agents[:, 1].copy(), agents[:, 2].copy()
+        self.states = np.zeros(len(self.rows), dtype=np.intp)
+
+    @property
+    def safe(self):
+        return len(self.rows) > 0
+
+    def color(self, i, j):
+        return self.color_rules[min(int(self.matrix[i, j]), 10)]
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "rule": self.rule, "steps": self.steps, "boundary": self.boundary,
+                  "step_count": self.step_count}
+        return params, {"matrix": self.matrix, "rows": self.rows, "cols": self.cols, "dirs": self.dirs,
+                        "states": self.states}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), params["rule"], params["steps"], 0, params["boundary"])
+        self.matrix[:] = arrays["matrix"]
+        self.rows, self.cols = np.array(arrays["rows"]), np.array(arrays["cols"])
+        self.dirs, self.states = np.array(arrays["dirs"]), np.array(arrays["states"])
+        self.step_count = params["step_count"]
+
+    def step(self):
+        width, height = self.dims
+        cells = self.rows * width + self.cols
+        flat = self.matrix.reshape(-1)
+        entries = self.table[self.states * self.colours + flat[cells]]
+        # agents sharing a cell all read it before any of them writes, and the lowest numbered agent's colour is the
+        # one kept, as numpy leaves the last of repeated assignments in place
+        flat[cells[::-1]] = entries[::-1, 0]
+        self.dirs = (self.dirs + entries[:, 1]) & 3
+        self.states = entries[:, 2]
+        rows, cols = self.rows + self.moves[self.dirs, 0], self.cols + self.moves[self.dirs, 1]
+        if self.boundary == "toroidal":
+            rows %= height
+            cols %= width
+        else:
+            off = (rows < 0) | (rows >= height) | (cols < 0) | (cols >= width)
+            if off.any():
+                if self.boundary == "dead":
+                    # agents that walk off the grid are gone
+                    rows, cols = rows[~off], cols[~off]
+                    self.dirs, self.states = self.dirs[~off], self.states[~off]
+                else:
+                    # and reflective ones turn round at the edge instead of stepping over it
+                    rows[off], cols[off] = self.rows[off], self.cols[off]
+                    self.dirs[off] ^= 2
+        self.rows, self.cols = rows, cols
+        return cells
+
+    def update(self):
+        # marking visits on a grid of flags is much cheaper than sorting them to drop the repeats
+        visited = self.visited.reshape(-1)
+        steps = 0
+        while steps < self.steps and self.safe:
+            visited[self.step()] = True
+            steps += 1
+        self.step_count += steps
+        cells = np.flatnonzero(visited)
+        visited[cells] = False
+        self.changes = np.empty((cells.size, 2), dtype=np.intp)
+        np.divmod(cells, self.dims[0], out=(self.changes[:, 0], self.changes[:, 1]))
+
+
+class AntColony(Colony):
+    @classmethod
+    def name(cls):
+        return "Ant Colony"
+
+    walker = LangtonsAnt
+    color_rules = LangtonsAnt.color_rules
+
+
+class TurmiteColony(Colony):
+    @classmethod
+    def name(cls):
+        return "Turmite Colony"
+
+    walker = Turmites
+    color_rules = Turmites.color_rules
+
+
+class ChunkedWalker(Checkpoint):
+    walker = None
+
+    def __init__(self, dims, rule=0, steps=1, chunk=64):
+        if chunk < 1 or chunk & (chunk - 1):
+            raise ValueError(f"chunk size {chunk} is not a power of two")
+        self.dims = dims  # width, height of the window onto the world that matrix shows
+        self.matrix = np.zeros((self.dims[1], self.dims[0]), dtype=np.uint8)
+        self.changes = np.empty((0, 2), dtype=np.intp)
+        self.view = [0, 0]  # world row, column of matrix[0][0]
+        self.rule = rule
+        self.steps = steps
+        self.table = self.walker.transitions(rule)
+        self.moves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        # the world is square tiles of chunk x chunk cells, made the first time the agent steps on them
+        self.size, self.shift = chunk, chunk.bit_length() - 1
+        self.chunks = {}
+        self.agent = [self.dims[1] // 2, self.dims[0] // 2]  # world row, column
+        self.dir = 0
+        self.state = 0
+        self.step_count = 0
+        self.safe = True
+
+    def color(self, i, j):
+        return self.color_rules[min(int(self.matrix[i, j]), 10)]
+
+    def checkpoint(self):
+        params = {"dims": list(self.dims), "rule": self.rule, "steps": self.steps, "chunk": self.size,
+                  "agent": list(self.agent), "dir": self.dir, "state": self.state, "step_count": self.step_count,
+                  "view": list(self.view)}
+        keys = np.array(list(self.chunks), dtype=np.int64).reshape(-1, 2)
+        tiles = np.frombuffer(b"".join(self.chunks.values()), dtype=np.uint8).reshape(-1, self.size * self.size)
+        return params, {"keys": keys, "tiles": tiles}
+
+    def restore(self, params, arrays):
+        self.__init__(tuple(params["dims"]), params["rule"], params["steps"], params["chunk"])
+        self.chunks = {key: bytearray(tile) for key, tile in zip(map(tuple, arrays["keys"].tolist()), arrays["tiles"])}
+        self.agent[:] = params["agent"]
+        self.dir, self.state = params["dir"], params["state"]
+        self.step_count = params["step_count"]
+        self.look(*params["view"])
+
+    def walk(self, count):
+        table, moves, chunks = self.table, self.moves, self.chunks
+        size, shift = self.size, self.shift
+        x, y = self.agent
+        direction, state = self.dir, self.state
+        touched = set()
+        remaining = count
+        while remaining:
+            # the agent's tile is held on to, so the dict is only looked up when it crosses into another one
+            key = (x >> shift, y >> shift)
+            chunk = chunks.get(key)
+            if chunk is None:
+                chunk = chunks[key] = bytearray(size * size)
+            touched.add(key)
+            top, left = key[0] << shift, key[1] << shift
+            lx, ly = x - top, y - left
+            for done in range(remaining):
+                if not (-1 < lx < size and -1 < ly < size):
+                    break
+                i = lx << shift | ly
+                chunk[i], turn, state = table[state][chunk[i]]
+                direction = (direction + turn) & 3
+                dx, dy = moves[direction]
+                lx += dx
+                ly += dy
+            else:
+                done = remaining
+            remaining -= done
+            x, y = top + lx, left + ly
+        self.agent[0], self.agent[1] = x, y
+        self.dir, self.state = direction, state
+        self.step_count += count
+        return touched
+
+    def tile(self, key):
+        return np.frombuffer(self.chunks[key], dtype=np.uint8).reshape(self.size, self.size)
+
+    def sync(self, keys):
+        # copies the parts of these tiles inside the window into matrix and returns the cells that changed
+        top, left = self.view
+        height, width = self.matrix.shape
+        changes = [np.empty((0, 2), dtype=np.intp)]
+        for key in keys:
+            a, b = key[0] << self.shift, key[1] << self.shift
+            rows = max(a, top), min(a + self.size, top + height)
+            cols = max(b, left), min(b + self.size, left + width)
+            if rows[0] >= rows[1] or cols[0] >= cols[1]:
+                continue
+            new = self.tile(key)[rows[0] - a:rows[1] - a, cols[0] - b:cols[1] - b]
+            old = self.matrix[rows[0] - top:rows[1] - top, cols[0] - left:cols[1] - left]
+            found = changed_cells(old, new)
+            found += (rows[0] - top, cols[0] - left)
+            old[:] = new
+            changes.append(found)
+        return np.concatenate(changes)
+
+    def look(self, top, left):
+        # moves the window so that matrix[0][0] is world cell (top, left)
+        self.view = [top, left]
+        self.matrix[:] = 0
+        height, width = self.matrix.shape
+        keys = [(r, c) for r in range(top >> self.shift, ((top + height - 1) >> self.shift) + 1)
+                for c in range(left >> self.shift, ((left + width - 1) >> self.shift) + 1) if (r, c) in self.chunks]
+        self.sync(keys)
+        self.changes = changed_cells(np.zeros_like(self.matrix), self.matrix)
+
+    def update(self):
+        self.changes = self.sync(self.walk(self.steps))
+
+
+class UnboundedAnt(ChunkedWalker):
+    @classmethod
+    def name(cls):
+        return "Unbounded Ant"
+
+    walker = LangtonsAnt
+    color_rules = LangtonsAnt.color_rules
+
+
+class UnboundedTurmite(ChunkedWalker):
+    @classmethod
+    def name(cls):
+        return "Unbounded Turmite"
+
+    walker = Turmites
+    color_rules = Turmites.color_rules
@@ -0,0 +1,83 @@
+from importlib import import_module
+
+
+class Backend:
+    def __init__(self, module, cls, arguments=None):
+        self.module, self.cls = module, cls
+        self.arguments = arguments  # maps the reference's constructor arguments onto this class's
+
+    def load(self):
+        # raises ImportError when the module needs a package that is not installed
+        return getattr(import_module(self.module), self.cls)
+
+    def __call__(self, *args, **kwargs):
+        if self.arguments is not None:
+            args, kwargs = self.arguments(*args, **kwargs)
+        return self.load()(*args, **kwargs)
+
+
+def grid_arguments(dims, rand=0, sparse=False, boundary="dead"):
+    return (dims, rand), {"boundary": boundary}
+
+
+def life_arguments(dims, rand=0, sparse=False, boundary="dead"):
+    return (dims, "B3/S23", rand), {"boundary": boundary}
+
+
+def walker_arguments(dims, rule=0, steps=1):
+    # a colony of one on a dead boundary stops where the lone walker does
+    return (dims, rule, steps, 1, "dead"), {}
+
+
+# every implementation of an automaton that steps exactly like its reference, in the order create() tries them:
+# fastest first as timed on grids up to a few hundred cells a side, the visualizer's included; each takes the
+# reference's constructor arguments
+registry = {
+    "SandPiles": {"jit": Backend("jit", "JitSandPiles"),
+                  "reference": Backend("automata", "SandPiles")},
+    # packed only overtakes numpy on quiet grids of a thousand cells a side and more, and is there for its memory
+    "GameOfLife": {"jit": Backend("jit", "JitGameOfLife", grid_arguments),
+                   "numpy": Backend("automata", "NumpyGameOfLife", grid_arguments),
+                   "packed": Backend("automata", "PackedGameOfLife", grid_arguments),
+                   "lifelike": Backend("automata", "LifeLike", life_arguments),
+                   "reference": Backend("automata", "GameOfLife")},
+    "BriansBrain": {"numpy": Backend("automata", "NumpyBriansBrain", grid_arguments),
+                    "reference": Backend("automata", "BriansBrain")},
+    "Elementary": {"bits": Backend("automata", "BitElementary"),
+                   "reference": Backend("automata", "Elementary")},
+    # a colony steps its agents as arrays, which only pays off for many of them; one agent walks far faster on
+    # the reference, and the colony is kept to be held to it
+    "LangtonsAnt": {"reference": Backend("automata", "LangtonsAnt"),
+                    "colony": Backend("automata", "AntColony", walker_arguments)},
+    "Turmites": {"reference": Backend("automata", "Turmites"),
+                 "colony": Backend("automata", "TurmiteColony", walker_arguments)},
+}
+
+
+def backends(automaton):
+    return registry.get(automaton, {"reference": Backend("automata", automaton)})
+
+
+def available(automaton):
+    names = []
+    for name, backend in backends(automaton).items():
+        try:
+            backend.load()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def create(automaton, *args, backend="best", **kwargs):
+    choices = list(backends(automaton))
+    if backend != "best" and backend not in choices:
+        raise ValueError(f"{automaton} has no {backend!r} backend, expected best or one of {', '.join(choices)}")
+    # a backend whose optional package is missing gives way to the next one down, ending at the reference
+    for name in choices[0 if backend == "best" else choices.index(backend):]:
+        try:
+            backends(automaton)[name].load()
+        except ImportError:
+            continue
+        return backends(automaton)[name](*args, **kwargs)
+    raise ImportError(f"no backend for {automaton} can be imported")
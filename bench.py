@@ -0,0 +1,166 @@
+from time import perf_counter
+from automata import SandPiles, GameOfLife, BriansBrain, Elementary, RockPaperScissors, LangtonsAnt, Turmites, \
+    HashLife, NumpyGameOfLife, NumpyBriansBrain, BitElementary, LifeLike, AntColony, TurmiteColony, \
+    UnboundedAnt, UnboundedTurmite, PackedGameOfLife
+import json
+import numpy as np
+import platform
+import random
+import tracemalloc
+
+
+def seeded(dims, density):
+    return int(density * dims[0] * dims[1])
+
+
+# how to build each automaton for a grid size and density; the walkers and the elementary rules have no
+# density, so they get a fixed workload instead
+cases = {
+    "SandPiles": lambda dims, density: SandPiles(dims, seeded(dims, density)),
+    "GameOfLife": lambda dims, density: GameOfLife(dims, seeded(dims, density)),
+    "BriansBrain": lambda dims, density: BriansBrain(dims, seeded(dims, density)),
+    "Elementary": lambda dims, density: Elementary(dims, 30, 1),
+    "RockPaperScissors": lambda dims, density: RockPaperScissors(dims, 9, seeded(dims, density)),
+    "LangtonsAnt": lambda dims, density: LangtonsAnt(dims, 1, 1000),
+    "Turmites": lambda dims, density: Turmites(dims, 0, 1000),
+    "AntColony": lambda dims, density: AntColony(dims, 1, 100, seeded(dims, density)),
+    "TurmiteColony": lambda dims, density: TurmiteColony(dims, 0, 100, seeded(dims, density)),
+    "UnboundedAnt": lambda dims, density: UnboundedAnt(dims, 3, 1000),
+    "UnboundedTurmite": lambda dims, density: UnboundedTurmite(dims, 0, 1000),
+    "NumpyGameOfLife": lambda dims, density: NumpyGameOfLife(dims, seeded(dims, density)),
+    "PackedGameOfLife": lambda dims, density: PackedGameOfLife(dims, seeded(dims, density)),
+    "NumpyBriansBrain": lambda dims, density: NumpyBriansBrain(dims, seeded(dims, density)),
+    "BitElementary": lambda dims, density: BitElementary(dims, 30, 1),
+    "HashLife": lambda dims, density: HashLife(dims, seeded(dims, density)),
+    "LifeLike": lambda dims, density: LifeLike(dims, "B36/S23", seeded(dims, density)),
+    "LifeLikeStarWars": lambda dims, density: LifeLike(dims, "B2/S345/C4", seeded(dims, density)),
+}
+
+
+def case_key(result):
+    return result["automaton"], result["width"], result["height"], result["density"], result["seed"]
+
+
+def time_updates(make, budget):
+    system = make()
+    times, changes = [], 0
+    while not times or sum(times) < budget:
+        # an ant that has walked off the grid does no more work, so start a fresh one
+        if not getattr(system, "safe", True):
+            system = make()
+        start = perf_counter()
+        system.update()
+        times.append(perf_counter() - start)
+        changes += len(system.changes)
+    return times, changes
+
+
+def bench_case(name, dims, density, seed, budget):
+    random.seed(seed)
+    times, changes = time_updates(lambda: cases[name](dims, density), budget)
+    generations = len(times)
+
+    # tracing allocations slows the pure Python engines down a lot, so peak memory gets its own short run
+    random.seed(seed)
+    tracemalloc.start()
+    system = cases[name](dims, density)
+    for _ in range(min(generations, 3)):
+        system.update()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # the median generation is much steadier than the mean against a busy machine
+    rate = 1 / max(float(np.median(times)), 1e-9)
+    return {"automaton": name, "width": dims[0], "height": dims[1], "density": density, "seed": seed,
+            "generations": generations, "seconds": sum(times), "gen_per_s": rate,
+            "cells_per_s": rate * dims[0] * dims[1], "peak_bytes": peak, "changes": changes / generations}
+
+
+def bench_draw(name, dims, density, seed, budget):
+    from gui import Painter
+
+    random.seed(seed)
+    painter = Painter()
+    painter.system = cases[name](dims, density)
+    painter.initialize()
+    painter.play = True
+
+    refreshes, refresh_time = 0, 0.0
+    while refreshes == 0 or refresh_time < budget:
+        start = perf_counter()
+        painter.refresh()
+        refresh_time += perf_counter() - start
+        refreshes += 1
+
+    # Painter.update steps the automaton too, so time the step on its own and keep only the remainder
+    step, stepping = painter.system.update, [0.0]
+
+    def timed_step():
+        start = perf_counter()
+        step()
+        stepping[0] += perf_counter() - start
+
+    painter.system.update = timed_step
+    updates, update_time = 0, 0.0
+    while updates == 0 or update_time < budget:
+        start = perf_counter()
+        painter.update(0)
+        update_time += perf_counter() - start
+        updates += 1
+    return {"automaton": name, "width": dims[0], "height": dims[1], "density": density, "seed": seed,
+            "refresh_ms": refresh_time / refreshes * 1000, "update_ms": (update_time - stepping[0]) / updates * 1000,
+            "frames": updates}
+
+
+def run_suite(names, sizes, densities, seeds, budget, draw=False):
+    bench = bench_draw if draw else bench_case
+    results = []
+    for name in names:
+        for size in sizes:
+            for density in densities:
+                for seed in seeds:
+                    result = bench(name, (size, size), density, seed, budget)
+                    results.append(result)
+                    if draw:
+                        print(f"{name:18} {size:5} {density:5.2f} {seed:3}  refresh {result['refresh_ms']:9.2f} ms"
+                              f"  update {result['update_ms']:9.2f} ms")
+                    else:
+                        print(f"{name:18} {size:5} {density:5.2f} {seed:3}  {result['gen_per_s']:10.1f} gen/s"
+                              f"  {result['cells_per_s']:9.3g} cells/s  {result['peak_bytes'] / 2 ** 20:8.1f} MiB"
+                              f"  {result['changes']:10.0f} changes")
+    return {"kind": "draw" if draw else "update", "python": platform.python_version(), "numpy": np.__version__,
+            "results": results}
+
+
+def compare(report, baseline, tolerance):
+    # a case is slower when it runs at less than (1 - tolerance) of the baseline speed
+    if report["kind"] == "draw":
+        speed = lambda result: 1 / max(result["refresh_ms"] + result["update_ms"], 1e-9)
+    else:
+        speed = lambda result: result["gen_per_s"]
+    before = {case_key(result): result for result in baseline["results"]}
+    slower = []
+    for result in report["results"]:
+        old = before.get(case_key(result))
+        if old is None:
+            continue
+        ratio = speed(result) / speed(old)
+        flag = "SLOWER" if ratio < 1 - tolerance else ""
+        print(f"{result['automaton']:18} {result['width']:5} {result['density']:5.2f} {result['seed']:3}  "
+              f"{ratio:6.2f}x  {flag}")
+        if flag:
+            slower.append(result)
+    return slower
+
+
+def main(args):
+    report = run_suite(args.automata or list(cases), args.sizes, args.densities, args.seeds, args.budget, args.draw)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+    if args.compare:
+        with open(args.compare) as file:
+            slower = compare(report, json.load(file), args.tolerance)
+        print(f"{len(slower)} of {len(report['results'])} cases slower than the baseline")
+        return 1 if slower else 0
+    return 0
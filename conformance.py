@@ -0,0 +1,103 @@
+from backends import available, backends
+from automata import boundaries, cell_set
+import numpy as np
+import random
+
+
+# random constructor arguments after dims for every automaton with more than one backend; they come from the case's
+# own generator, so the module level one is left for seeding the grid
+def grid_case(rng, dims):
+    return rng.randint(0, 2 * dims[0] * dims[1]), rng.random() < 0.5, rng.choice(boundaries)
+
+
+cases = {
+    "SandPiles": lambda rng, dims: (rng.randint(0, 8 * dims[0] * dims[1]), rng.random() < 0.5),
+    "GameOfLife": grid_case,
+    "BriansBrain": grid_case,
+    "Elementary": lambda rng, dims: (rng.randint(0, 255), rng.randint(0, 1)),
+    "LangtonsAnt": lambda rng, dims: (rng.randint(0, 4), rng.randint(1, 64)),
+    "Turmites": lambda rng, dims: (rng.randint(0, 7), rng.randint(1, 64)),
+}
+
+
+def state(system):
+    # engines step in place and swap buffers, so both are copied
+    changes = set(system.changes) if isinstance(system.changes, set) else cell_set(system.changes)
+    return np.array(system.matrix), changes
+
+
+def difference(expected, actual):
+    if expected[0].shape != actual[0].shape:
+        return f"matrix has shape {actual[0].shape}, not {expected[0].shape}"
+    cells = np.argwhere(expected[0] != actual[0])
+    if len(cells):
+        return f"matrix differs at {len(cells)} cells, first {tuple(cells[0].tolist())}"
+    if expected[1] != actual[1]:
+        extra = expected[1] ^ actual[1]
+        return f"changes differ at {len(extra)} cells, first {min(extra)}"
+    return None
+
+
+def run(backend, dims, args, seed, generations):
+    random.seed(seed)
+    system = backend(dims, *args)
+    states = [state(system)]
+    for _ in range(generations):
+        system.update()
+        states.append(state(system))
+    # a pile settled in one call ends where its backend's own settling leaves it
+    if hasattr(system, "stabilize"):
+        system.stabilize()
+        states.append(state(system))
+    return states
+
+
+def check_case(automaton, names, dims, args, seed, generations):
+    # a case the reference itself cannot run leaves nothing to hold the backends to
+    implementations = backends(automaton)
+    try:
+        expected = run(implementations["reference"], dims, args, seed, generations)
+    except Exception:
+        return None
+    failures = []
+    for name in names:
+        try:
+            actual = run(implementations[name], dims, args, seed, generations)
+        except Exception as error:
+            failures.append((name, f"raised {error!r}"))
+            continue
+        for generation, (before, after) in enumerate(zip(expected, actual)):
+            problem = difference(before, after)
+            if problem is not None:
+                failures.append((name, f"generation {generation}: {problem}"))
+                break
+    return failures
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    failed = {}
+    for automaton in args.automata or list(cases):
+        names = [name for name in available(automaton) if name != "reference"]
+        missing = [name for name in backends(automaton) if name not in names + ["reference"]]
+        checked = skipped = 0
+        for _ in range(args.cases):
+            dims = (rng.randint(1, args.max_size), rng.randint(1, args.max_size))
+            params, seed = cases[automaton](rng, dims), rng.randrange(1 << 32)
+            failures = check_case(automaton, names, dims, params, seed, args.generations)
+            if failures is None:
+                skipped += 1
+                continue
+            checked += 1
+            for name, problem in failures:
+                failed[automaton, name] = failed.get((automaton, name), 0) + 1
+                # a broken backend usually fails most cases, and the first few say as much as all of them
+                if failed[automaton, name] <= 3:
+                    print(f"{automaton} {name} FAILED on {dims[0]}x{dims[1]} {' '.join(map(str, params))} "
+                          f"seed {seed}: {problem}")
+        notes = [f"{name} failed {failed[automaton, name]}" for name in names if (automaton, name) in failed]
+        notes += [f"{skipped} the reference could not run"] if skipped else []
+        notes += [f"{name} not installed" for name in missing]
+        print(f"{automaton}: {', '.join(names) or 'no backends'} against the reference on {checked} cases"
+              + "".join(", " + note for note in notes))
+    return 1 if failed else 0
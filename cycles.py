@@ -0,0 +1,145 @@
+from collections import deque
+from automata import cell_array
+import numpy as np
+
+
+def cell_keys(flat, states):
+    # one random looking word per (cell, state) pair, from splitmix64's finaliser worked in place
+    z = flat.astype(np.uint64)
+    z *= np.uint64(0x9E3779B97F4A7C15)
+    z += states.astype(np.int64).astype(np.uint64)
+    spare = np.empty_like(z)
+    for shift, factor in ((30, 0xBF58476D1CE4E5B9), (27, 0x94D049BB133111EB)):
+        np.right_shift(z, np.uint64(shift), out=spare)
+        z ^= spare
+        z *= np.uint64(factor)
+    np.right_shift(z, np.uint64(31), out=spare)
+    z ^= spare
+    return z
+
+
+class CycleDetector:
+    modes = ("pause", "replay")
+
+    def __init__(self, system, window=256, mode="pause"):
+        self.system = system
+        self.window = window
+        self.mode = mode
+        self.generation = 0
+        self.period, self.start = None, None
+        self.hooks = []
+        self.dense = not isinstance(system.matrix, list)
+        if self.dense:
+            self.shadow = np.array(system.matrix, copy=True)
+        else:
+            # list grids are read through color(), which is all they share
+            self.shades = {rgb: state for state, rgb in enumerate(system.color_rules.values())}
+            self.shadow = {}
+        self.hash = self.full_hash()
+        self.seen = {self.hash: 0}
+        self.recent = deque([self.hash])
+        self.candidate = None
+        self.frames, self.phase, self.replayed = [], 0, None
+
+    def __getattr__(self, name):
+        # stands in for the automaton anywhere one is expected
+        return getattr(self.system, name)
+
+    @property
+    def changes(self):
+        return self.replayed if self.replayed is not None else self.system.changes
+
+    def full_hash(self):
+        if not self.dense:
+            h = 0
+            for i in range(self.dims[1]):
+                for j in range(self.dims[0]):
+                    self.shadow[i, j] = self.shades[self.system.color(i, j)]
+                    h ^= hash((i, j, self.shadow[i, j]))
+            return h
+        h, width = np.uint64(0), self.shadow.shape[1]
+        # a band of rows at a time keeps the 64 bit temporaries small on huge grids
+        band = max(1, (1 << 20) // width)
+        for first in range(0, len(self.shadow), band):
+            rows = self.shadow[first:first + band]
+            flat = np.arange(first * width, first * width + rows.size, dtype=np.int64)
+            h ^= np.bitwise_xor.reduce(cell_keys(flat, rows.ravel()))
+        return int(h)
+
+    def changed(self):
+        changes = self.system.changes
+        if not self.dense:
+            h, cells = 0, list(changes)
+            for i, j in cells:
+                state = self.shades[self.system.color(i, j)]
+                h ^= hash((i, j, self.shadow[i, j])) ^ hash((i, j, state))
+                self.shadow[i, j] = state
+            return h, (cells, [self.system.matrix[i][j] for i, j in cells])
+        if not isinstance(changes, np.ndarray):
+            changes = cell_array(changes)
+        if not len(changes):
+            return 0, (changes, self.shadow[:0, 0])
+        rows, cols = changes[:, 0], changes[:, 1]
+        flat = rows.astype(np.int64) * self.shadow.shape[1] + cols
+        before, after = self.shadow[rows, cols], self.system.matrix[rows, cols]
+        self.shadow[rows, cols] = after
+        # xor out each changed cell's old state and xor in its new one
+        h = np.bitwise_xor.reduce(cell_keys(np.concatenate([flat, flat]), np.concatenate([before, after])))
+        return int(h), (changes, after)
+
+    def snapshot(self):
+        _, arrays = self.system.checkpoint()
+        return {name: np.array(array, copy=True) for name, array in arrays.items()}
+
+    def update(self):
+        if self.period is not None:
+            if self.mode == "replay":
+                self.replay()
+            else:
+                self.replayed = np.empty((0, 2), dtype=np.intp) if self.dense else set()
+            return
+        self.system.update()
+        self.generation += 1
+        h, frame = self.changed()
+        self.hash ^= h
+        self.observe(frame)
+
+    def observe(self, frame):
+        if self.candidate is not None:
+            # a repeated hash is only a candidate until the full state is seen to come round again, which also
+            # catches state the hash cannot see, like the health of Rock Paper Scissors cells
+            start, period, arrays = self.candidate
+            self.frames.append(frame)
+            if self.generation - start < period:
+                return
+            current = self.snapshot()
+            if all(np.array_equal(current[name], arrays[name]) for name in arrays):
+                self.period, self.start = period, start
+                for hook in self.hooks:
+                    hook(self)
+                return
+            self.candidate, self.frames = None, []
+        earlier = self.seen.get(self.hash)
+        self.seen[self.hash] = self.generation
+        self.recent.append(self.hash)
+        if len(self.recent) > self.window:
+            oldest = self.recent.popleft()
+            if self.seen.get(oldest, self.generation) <= self.generation - self.window:
+                del self.seen[oldest]
+        if earlier is not None and self.candidate is None:
+            self.candidate = (self.generation, self.generation - earlier, self.snapshot())
+
+    def replay(self):
+        # the cycle was recorded as the cells each generation wrote, so playing it back costs no stepping; only
+        # the visible grid moves on, anything else the automaton keeps stays where the cycle was found
+        changes, values = self.frames[self.phase]
+        if not self.dense:
+            matrix = self.system.matrix
+            for (i, j), value in zip(changes, values):
+                matrix[i][j] = value
+            changes = set(changes)
+        elif len(changes):
+            self.system.matrix[changes[:, 0], changes[:, 1]] = values
+        self.replayed = changes
+        self.phase = (self.phase + 1) % len(self.frames)
+        self.generation += 1
@@ -0,0 +1,118 @@
+from queue import Queue
+from threading import Thread
+from time import perf_counter
+import numpy as np
+import struct
+import subprocess
+import sys
+import zlib
+
+
+def palette(color_rules):
+    states = sorted(color_rules)
+    lut = np.zeros((states[-1] - states[0] + 1, 3), dtype=np.uint8)
+    for state in states:
+        lut[state - states[0]] = [round(c * 255) for c in color_rules[state]]
+    return states[0], lut
+
+
+def render(system, low, lut, scale=1):
+    states = np.clip(np.asarray(system.matrix) - low, 0, len(lut) - 1)
+    # grid row 0 is drawn at the bottom of the canvas, while images start at the top
+    frame = np.take(lut, states[::-1], axis=0)
+    if scale > 1:
+        frame = frame.repeat(scale, axis=0).repeat(scale, axis=1)
+    return frame
+
+
+def frames(system, count, every=1, scale=1):
+    low, lut = palette(system.color_rules)
+    for index in range(count):
+        if index:
+            for _ in range(every):
+                system.update()
+        yield render(system, low, lut, scale)
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def png_bytes(frame, level=1):
+    h, w = frame.shape[0], frame.shape[1]
+    rows = np.zeros((h, 1 + 3 * w), dtype=np.uint8)  # each scanline starts with filter type 0
+    rows[:, 1:] = frame.reshape(h, 3 * w)
+    return b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)) + \
+        png_chunk(b"IDAT", zlib.compress(rows.tobytes(), level)) + png_chunk(b"IEND", b"")
+
+
+def png_writer(pattern):
+    def write(index, frame):
+        with open(pattern % index, "wb") as file:
+            file.write(png_bytes(frame))
+    return write
+
+
+def raw_writer(stream):
+    def write(index, frame):
+        stream.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+    return write
+
+
+def stream(frames, write, threads=1, depth=8):
+    # stepping and palette lookup stay on this thread, writing happens on the others; zlib and pipe writes let go
+    # of the GIL, and the bounded queue keeps at most depth frames in memory
+    queue, errors = Queue(depth), []
+
+    def drain():
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            if not errors:
+                try:
+                    write(*item)
+                except Exception as error:
+                    errors.append(error)
+
+    workers = [Thread(target=drain) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    count = 0
+    try:
+        for count, frame in enumerate(frames, 1):
+            if errors:
+                break
+            queue.put((count - 1, frame))
+    finally:
+        for _ in workers:
+            queue.put(None)
+        for worker in workers:
+            worker.join()
+    if errors:
+        raise errors[0]
+    return count
+
+
+def main(args, system):
+    start = perf_counter()
+    source = frames(system, args.frames, args.every, args.scale)
+    width, height = system.dims[0] * args.scale, system.dims[1] * args.scale
+    if args.png:
+        count = stream(source, png_writer(args.png), args.threads)
+    elif args.encoder:
+        encoder = subprocess.Popen(args.encoder.format(width=width, height=height), shell=True, stdin=subprocess.PIPE)
+        try:
+            count = stream(source, raw_writer(encoder.stdin))
+        finally:
+            encoder.stdin.close()
+            encoder.wait()
+    else:
+        output = sys.stdout.buffer if args.raw == "-" else open(args.raw, "wb")
+        try:
+            count = stream(source, raw_writer(output))
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+    elapsed = perf_counter() - start
+    print(f"{count} frames of {width}x{height} in {elapsed:.2f}s ({count / elapsed:.1f} frames/s)", file=sys.stderr)
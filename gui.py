@@ -0,0 +1,755 @@
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.core.audio import SoundLoader
+from kivy.graphics import Color, Rectangle, Line
+from kivy.graphics.texture import Texture
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.button import Button
+from kivy.uix.dropdown import DropDown
+from kivy.uix.textinput import TextInput
+from kivy.uix.floatlayout import FloatLayout
+from webbrowser import open
+from os import listdir
+from time import perf_counter
+from automata import SandPiles, GameOfLife, BriansBrain, Elementary, RockPaperScissors, LangtonsAnt, Turmites, \
+    HashLife, LifeLike, AntColony, TurmiteColony, UnboundedAnt, UnboundedTurmite, boundaries
+from profiling import FrameProfiler
+from stepping import Stepper
+from cycles import CycleDetector
+from backends import create
+import numpy as np
+import random
+import regex
+
+font_family = 'Comic'
+
+
+class NumericInput(TextInput):
+    def insert_text(self, substring, from_undo=False):
+        pat = regex.compile('[^0-9]')
+        substring = regex.sub(pat, '', substring)
+        return super(NumericInput, self).insert_text(substring, from_undo=from_undo)
+
+
+class Painter(FloatLayout):
+    play = False
+    system = None
+    draw_x, draw_y = Window.size[0] * 0.02, Window.size[1] * 0.02
+    draw_w, draw_h = Window.size[0] * 0.96, Window.size[1] * 0.64
+    texture, pixels, rectangle = None, None, None
+    low, palette, shades = 0, None, None
+    profiler, stepper = None, None
+    # what the texels are drawn from: the automaton itself, or with a stepper the last frame it handed over
+    source = None
+    # first row and column, then rows and columns of the grid in view; once there are more cells than pixels each
+    # texel shows a block of cells, either the highest state in it or just its first cell
+    view, block, detail = None, 1, "max"
+    # the scroll of a ring grid the texels were last drawn at, see rows()
+    scrolled = 0
+
+    def initialize(self):
+        states = sorted(self.system.color_rules)
+        self.low = states[0]
+        self.palette = np.zeros((states[-1] - states[0] + 1, 3), dtype=np.uint8)
+        self.shades = {}
+        for state in states:
+            rgb = self.system.color_rules[state]
+            self.palette[state - self.low] = self.shades[rgb] = [round(c * 255) for c in rgb]
+
+        self.reset()
+        self.source = self.system
+        self.view = [0.0, 0.0, self.system.dims[1], self.system.dims[0]]
+        self.frame()
+        self.refresh()
+
+    def frame(self):
+        rows, cols = self.view[2], self.view[3]
+        self.block = max(1, -(-cols // int(self.draw_w)), -(-rows // int(self.draw_h)))
+        height, width = -(-rows // self.block), -(-cols // self.block)
+        if self.rectangle is not None and self.pixels.shape[:2] == (height, width):
+            return
+        self.pixels = np.zeros((height, width, 3), dtype=np.uint8)
+        self.texture = Texture.create(size=(width, height), colorfmt='rgb')
+        self.texture.mag_filter = 'nearest'
+        if self.rectangle is None:
+            with self.canvas:
+                Color(1, 1, 1)
+                self.rectangle = Rectangle(texture=self.texture, pos=(self.draw_x, self.draw_y),
+                                           size=(self.draw_w, self.draw_h))
+        else:
+            self.rectangle.texture = self.texture
+
+    def reset(self):
+        self.canvas.clear()
+        self.view, self.rectangle = None, None
+        with self.canvas:
+            Color(1, 1, 1)
+            Line(rectangle=(self.draw_x, self.draw_y,
+                 self.draw_w, self.draw_h), width=1.2)
+
+    def visible(self):
+        return int(self.view[0]), int(self.view[1]), self.view[2], self.view[3]
+
+    def rows(self, rows):
+        # a ring grid like BitElementary scrolls: on screen row d shows its row (d + scroll) % height
+        scroll = getattr(self.source, "scroll", 0)
+        if not scroll:
+            return rows
+        if isinstance(rows, slice):
+            rows = np.arange(*rows.indices(self.source.dims[1]))
+        return (rows + scroll) % self.source.dims[1]
+
+    def states(self, rows=slice(None), cols=slice(None)):
+        return np.clip(self.source.matrix[self.rows(rows), cols] - self.low, 0, len(self.palette) - 1)
+
+    def texels(self):
+        row, col, rows, cols = self.visible()
+        k = self.block
+        if k > 1 and self.detail == "sample":
+            return self.states(slice(row, row + rows, k), slice(col, col + cols, k))
+        if k == 1:
+            return self.states(slice(row, row + rows), slice(col, col + cols))
+        return self.pooled(self.source.matrix, row, col, rows, cols)
+
+    def pooled(self, matrix, row, col, rows, cols):
+        k = self.block
+        # pooling the raw states first leaves far fewer to clip, and whole bands of rows reduce fastest as a reshape;
+        # a few million cells at a time, so a packed grid never unpacks the whole view at once
+        step = k * max(1, (1 << 22) // (k * cols))
+        bands = []
+        for first in range(row, row + rows, step):
+            cells = matrix[self.rows(slice(first, min(first + step, row + rows))), col:col + cols]
+            whole = len(cells) - len(cells) % k
+            bands.append(cells[:whole].reshape(whole // k, k, cols).max(axis=1))
+            if whole < len(cells):
+                bands.append(cells[whole:].max(axis=0, keepdims=True))
+        bands = np.vstack(bands)
+        return np.clip(np.maximum.reduceat(bands, np.arange(0, cols, k), axis=1) - self.low, 0, len(self.palette) - 1)
+
+    def refresh(self):
+        start = perf_counter()
+        self.scrolled = getattr(self.source, "scroll", 0)
+        if not isinstance(self.source.matrix, list):
+            np.take(self.palette, self.texels(), axis=0, out=self.pixels)
+        elif self.block > 1 and self.detail != "sample":
+            # pooling reads every cell in view, which goes far faster once their rows are copied into an array;
+            # every list grid colours a cell by its state, capped at the last shade, just as an array is drawn
+            row, col, rows, cols = self.visible()
+            cells = np.array([line[col:col + cols] for line in self.source.matrix[row:row + rows]])
+            np.take(self.palette, self.pooled(cells, 0, 0, rows, cols), axis=0, out=self.pixels)
+        else:
+            # list grids are sampled a texel at a time, so only cells on screen are looked at
+            row, col = self.visible()[:2]
+            k = self.block
+            for a in range(self.pixels.shape[0]):
+                for b in range(self.pixels.shape[1]):
+                    self.pixels[a, b] = self.shades[self.source.color(row + a * k, col + b * k)]
+        self.blit(0, self.pixels.shape[0] - 1)
+        if self.profiler is not None:
+            self.profiler.refreshed(perf_counter() - start)
+
+    def texel(self, i, j, bottom, right):
+        if self.block == 1 or self.detail == "sample":
+            return self.shades[self.source.color(i, j)]
+        # a changed block is pooled from the states a row slice at a time, the way refresh() pools the whole view
+        k = self.block
+        state = max(max(line[j:min(j + k, right)]) for line in self.source.matrix[i:min(i + k, bottom)])
+        return self.palette[min(max(state - self.low, 0), len(self.palette) - 1)]
+
+    def blit(self, first, last):
+        # texture rows run bottom up like the grid rows, so a band of rows is one contiguous upload
+        band = self.pixels[first:last + 1]
+        self.texture.blit_buffer(band.tobytes(), size=(band.shape[1], band.shape[0]), pos=(0, first),
+                                 colorfmt='rgb', bufferfmt='ubyte')
+        self.canvas.ask_update()
+
+    def update(self, dt):
+        if not self.play:
+            # a paused stepper still hands over the generation it was on, and whatever a pan moved
+            if self.stepper is not None:
+                self.show_latest()
+            return
+        if self.profiler is not None:
+            self.profiled_update(dt)
+        elif self.stepper is not None:
+            self.show_latest()
+        else:
+            self.system.update()
+            self.draw(self.system.changes)
+
+    def latest(self):
+        # the stepper hands over a copy of each generation it finishes, so drawing never waits for it
+        frame = self.stepper.take()
+        if frame is not None:
+            self.source = frame
+        return frame
+
+    def show_latest(self):
+        # the stepper keeps going on its own thread; draw the last generation it finished, with the changes of
+        # every generation since the previous frame, or nothing if it has not finished one since
+        frame = self.latest()
+        if frame is None:
+            return 0.0, 0
+        if frame.changes is None:
+            self.refresh()
+            return frame.busy, frame.dims[0] * frame.dims[1]
+        self.draw(frame.changes)
+        return frame.busy, len(frame.changes)
+
+    def profiled_update(self, dt):
+        start = perf_counter()
+        if self.stepper is not None:
+            stepped = start
+            update, changed = self.show_latest()
+        else:
+            self.system.update()
+            stepped = perf_counter()
+            update, changed = stepped - start, len(self.system.changes)
+            self.draw(self.system.changes)
+        drawn = perf_counter()
+        self.profiler.record(update, drawn - stepped, changed, len(self.canvas.children), dt)
+
+    def draw(self, changes):
+        if not len(changes):
+            return
+        # a change costs about as much as repainting one texel, pooled or not
+        if len(changes) > self.pixels.shape[0] * self.pixels.shape[1]:
+            self.refresh()
+            return
+        # a ring grid that has scrolled since the last frame has moved every row on screen
+        if getattr(self.source, "scroll", 0) != self.scrolled:
+            self.refresh()
+            return
+        row, col, rows, cols = self.visible()
+        k = self.block
+        if isinstance(changes, np.ndarray) and not isinstance(self.source.matrix, list):
+            a, b = changes[:, 0] - row, changes[:, 1] - col
+            if self.scrolled:
+                a = (changes[:, 0] - self.scrolled) % self.source.dims[1] - row
+            if rows < self.source.dims[1] or cols < self.source.dims[0]:
+                inside = (a >= 0) & (a < rows) & (b >= 0) & (b < cols)
+                a, b = a[inside], b[inside]
+            if k > 1 and self.detail == "sample":
+                sampled = (a % k == 0) & (b % k == 0)
+                a, b = a[sampled] // k, b[sampled] // k
+                states = self.states(a * k + row, b * k + col)
+            elif k > 1:
+                # only the blocks holding a change are pooled again
+                width = self.pixels.shape[1]
+                a, b = np.divmod(np.unique(a // k * width + b // k), width)
+                block_rows = np.minimum(a[:, None] * k + np.arange(k), rows - 1) + row
+                block_cols = np.minimum(b[:, None] * k + np.arange(k), cols - 1) + col
+                states = self.states(block_rows[:, :, None], block_cols[:, None, :]).max(axis=(1, 2))
+            else:
+                states = self.states(a + row, b + col)
+            if len(a):
+                self.pixels[a, b] = self.palette[states]
+                self.blit(a.min(), a.max())
+        else:
+            # sampling only shows the changes in a block's first cell, pooling repaints every block holding one
+            pooled = k > 1 and self.detail != "sample"
+            blocks = {((i - row) // k, (j - col) // k) for i, j in changes
+                      if 0 <= i - row < rows and 0 <= j - col < cols and (pooled or not (i - row) % k + (j - col) % k)}
+            for a, b in blocks:
+                self.pixels[a, b] = self.texel(row + a * k, col + b * k, row + rows, col + cols)
+            if blocks:
+                self.blit(min(a for a, _ in blocks), max(a for a, _ in blocks))
+
+    def redraw(self):
+        # a frame left waiting is drawn whole anyway, so its changes are not needed
+        if self.stepper is not None:
+            self.latest()
+        self.frame()
+        self.refresh()
+
+    def zoom(self, x, y, factor):
+        row, col, rows, cols = self.view
+        # the cell under the pointer stays where it is
+        fy, fx = (y - self.draw_y) / self.draw_h, (x - self.draw_x) / self.draw_w
+        new_rows = min(max(round(rows / factor), 1), self.system.dims[1])
+        new_cols = min(max(round(cols / factor), 1), self.system.dims[0])
+        self.view = [row + fy * (rows - new_rows), col + fx * (cols - new_cols), new_rows, new_cols]
+        self.pan(0, 0)
+        self.redraw()
+
+    def pan(self, rows, cols):
+        before = self.visible()
+        row, col = self.view[0] + rows, self.view[1] + cols
+        self.view[0] = min(max(row, 0), self.system.dims[1] - self.view[2])
+        self.view[1] = min(max(col, 0), self.system.dims[0] - self.view[3])
+        # an unbounded world has no edge to stop at, so the automaton's window onto it slides along instead
+        over = int(row - self.view[0]), int(col - self.view[1])
+        if any(over) and hasattr(self.system, "look"):
+            system = self.system
+
+            def look():
+                system.look(system.view[0] + over[0], system.view[1] + over[1])
+            if self.stepper is not None:
+                self.stepper.call(look)
+            else:
+                look()
+            return True
+        return self.visible() != before
+
+    def on_touch_down(self, touch):
+        if self.view is None or not (self.draw_x <= touch.x <= self.draw_x + self.draw_w and
+                                     self.draw_y <= touch.y <= self.draw_y + self.draw_h):
+            return super(Painter, self).on_touch_down(touch)
+        if touch.is_mouse_scrolling:
+            if touch.button in ("scrolldown", "scrollup"):
+                self.zoom(touch.x, touch.y, 2 if touch.button == "scrolldown" else 0.5)
+            return True
+        touch.grab(self)
+        return True
+
+    def on_touch_move(self, touch):
+        if touch.grab_current is not self:
+            return super(Painter, self).on_touch_move(touch)
+        # dragging carries the grid along with the pointer
+        if self.pan(-touch.dy * self.view[2] / self.draw_h, -touch.dx * self.view[3] / self.draw_w):
+            self.redraw()
+        return True
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return super(Painter, self).on_touch_up(touch)
+        touch.ungrab(self)
+        return True
+
+
+class ProfileOverlay(Label):
+    def show(self, profiler, sample):
+        # laying out text costs about as much as a small frame, so only every tenth frame updates it
+        if profiler.frames % 10:
+            return
+        summary = profiler.summary()
+        self.text = (f"update {summary['update']['mean'] * 1000:.1f} ms (p95 {summary['update']['p95'] * 1000:.1f})   "
+                     f"draw {summary['draw']['mean'] * 1000:.1f} ms (p95 {summary['draw']['p95'] * 1000:.1f})\n"
+                     f"changes {sample['changes']}   instructions {sample['instructions']}   "
+                     f"missed {profiler.missed} of {profiler.frames}")
+
+
+class OptionsMenu(FloatLayout):
+    def __init__(self, **kwargs):
+        super(OptionsMenu, self).__init__(**kwargs)
+        self.add_widget(Label(text="Frames\nPer Second:", pos_hint={"x": 0.06, "y": 0.8}, size_hint=(0.3, 0.1),
+                              halign="left", valign="bottom", font_size=18))
+        self.add_widget(Label(text="Dimensions: ", pos_hint={"x": 0.06, "y": 0.6}, size_hint=(0.3, 0.1),
+                              halign="left", valign="bottom", font_size=22))
+        self.frame_input = NumericInput(text="5", pos_hint={"x": 0.59, "y": 0.8}, size_hint=(0.4, 0.09),
+                                        font_size=20)
+        self.dims_input = NumericInput(text="80", pos_hint={"x": 0.59, "y": 0.6}, size_hint=(0.4, 0.09),
+                                       font_size=20)
+
+        self.refer_button = Button(text="Reading Material on\nCellular Automata", halign="center",
+                                   pos_hint={"x": 0.02, "y": 0.2}, size_hint=(0.47, 0.12), font_size=13)
+        self.detail_button = Button(text="Zoomed Out: Max", pos_hint={"x": 0.51, "y": 0.2}, size_hint=(0.47, 0.12),
+                                    font_size=16)
+        self.refer_button.bind(on_release=self.linker)
+        self.boundary_button = Button(text="Boundary: Dead", pos_hint={"x": 0.02, "y": 0.515}, size_hint=(0.47, 0.08),
+                                      font_size=16)
+        self.boundary_button.bind(on_release=self.cycle_boundary)
+        self.cycles_button = Button(text="Cycles: Off", pos_hint={"x": 0.51, "y": 0.515}, size_hint=(0.47, 0.08),
+                                    font_size=16)
+        self.cycles_button.bind(on_release=self.cycle_cycles)
+        self.profile_button = Button(text="Profiler: Off", pos_hint={"x": 0.02, "y": 0.38}, size_hint=(0.47, 0.12),
+                                     font_size=16)
+        self.export_button = Button(text="Export Profile", pos_hint={"x": 0.51, "y": 0.38}, size_hint=(0.47, 0.12),
+                                    font_size=16, disabled=True)
+        self.background_button = Button(text="Background Stepping: Off", pos_hint={"x": 0.02, "y": 0.04},
+                                        size_hint=(0.47, 0.12), font_size=14)
+        self.background_button.bind(on_release=self.toggle_background)
+        self.add_widget(Label(text="Gen/s (0 = max):", pos_hint={"x": 0.51, "y": 0.04}, size_hint=(0.25, 0.12),
+                              font_size=14))
+        self.rate_input = NumericInput(text="0", pos_hint={"x": 0.77, "y": 0.05}, size_hint=(0.21, 0.09),
+                                       font_size=20)
+
+        self.add_widget(self.frame_input)
+        self.add_widget(self.dims_input)
+        self.add_widget(self.refer_button)
+        self.add_widget(self.detail_button)
+        self.add_widget(self.boundary_button)
+        self.add_widget(self.cycles_button)
+        self.add_widget(self.profile_button)
+        self.add_widget(self.export_button)
+        self.add_widget(self.background_button)
+        self.add_widget(self.rate_input)
+
+    @property
+    def boundary(self):
+        return self.boundary_button.text.split(": ")[1].lower()
+
+    def cycle_boundary(self, instance):
+        # what the Life-like and Rock Paper Scissors grids see past their edges
+        following = boundaries[(boundaries.index(self.boundary) + 1) % len(boundaries)]
+        instance.text = "Boundary: " + following.capitalize()
+
+    @property
+    def cycles(self):
+        return self.cycles_button.text.split(": ")[1].lower()
+
+    def cycle_cycles(self, instance):
+        # once a run settles into a cycle it can stop there or keep replaying the cycle without stepping
+        modes = ("off",) + CycleDetector.modes
+        instance.text = "Cycles: " + modes[(modes.index(self.cycles) + 1) % len(modes)].capitalize()
+
+    @staticmethod
+    def toggle_background(instance):
+        on = instance.text.endswith("Off")
+        instance.text = "Background Stepping: " + ("On" if on else "Off")
+
+    @staticmethod
+    def linker(_):
+        open(r"https://en.wikipedia.org/wiki/Cellular_automaton")
+
+
+class Interface(FloatLayout):
+    def __init__(self, **kwargs):
+        super(Interface, self).__init__(**kwargs)
+
+        self.run_button = Button(text="Generate", pos_hint={"x": 0.62, "y": 0.9}, size_hint=(0.36, 0.09), font_size=36,
+                                 disabled=True, font_name=font_family)
+        self.replay_button = Button(text="X", pos_hint={"x": 0.02, "y": 0.02}, size_hint=(0.15, 0.1), font_size=60,
+                                    disabled=True, font_name=font_family)
+        self.options_button = Button(text="O", pos_hint={"x": 0.83, "y": 0.02}, size_hint=(0.15, 0.1), font_size=60,
+                                     font_name=font_family)
+
+        self.dropdown = DropDown()
+        for algo in [SandPiles, GameOfLife, BriansBrain, LifeLike, Elementary, RockPaperScissors, LangtonsAnt,
+                     Turmites, UnboundedAnt, UnboundedTurmite, HashLife]:
+            btn = Button(text=algo.name(), size_hint_y=None,
+                         height=60, font_size=32, font_name=font_family)
+            btn.bind(on_release=lambda ob: self.dropdown.select(ob.text))
+            self.dropdown.add_widget(btn)
+        self.main_button = Button(text='Select Algorithm', pos_hint={"x": 0.02, "y": 0.9}, size_hint=(0.58, 0.09),
+                                  font_size=36, font_name=font_family)
+        self.main_button.bind(on_release=self.dropdown.open)
+
+        # self.last_song = Button(text="|<<", pos_hint={"x": 0.02, "y": 0.68}, size_hint=(0.25, 0.06), disabled=True,
+        #                         font_size=24, font_name=font_family)
+        # self.last_song.bind(on_press=self.change_song)
+        # self.next_song = Button(text=">>|", pos_hint={"x": 0.73, "y": 0.68}, size_hint=(0.25, 0.06), disabled=True,
+        #                         font_size=24, font_name=font_family)
+        # self.next_song.bind(on_press=self.change_song)
+        # self.play_pause = Button(text="Music: Off", pos_hint={"x": 0.29, "y": 0.68}, size_hint=(0.42, 0.06),
+        #                          font_size=18, font_name=font_family)
+        # self.play_pause.bind(on_press=self.play_music)
+
+        self.add_widget(self.run_button)
+        self.add_widget(self.replay_button)
+        self.add_widget(self.options_button)
+        self.add_widget(self.main_button)
+
+        # self.library = [
+        #     (SoundLoader.load(f"./music/{file}"), file[:-4]) for file in listdir("./music")]
+        # self.song_index = 0
+        # random.shuffle(self.library)
+        # self.sound = self.library[0][0]
+        # self.song_count = len(self.library) - 1
+
+        # self.add_widget(self.last_song)
+        # self.add_widget(self.play_pause)
+        # self.add_widget(self.next_song)
+
+        self.interface_count = len(self.children)
+
+    # def play_music(self, _):
+    #     if not self.sound:
+    #         print("Error: song not found")
+    #         return
+
+    #     if self.play_pause.text == "Music: Off":
+    #         self.last_song.disabled = False
+    #         self.next_song.disabled = False
+
+    #     if self.sound.state == "stop":
+    #         self.sound.play()
+
+    #     elif self.sound.state == "play":
+    #         self.sound.stop()
+
+    #     self.play_pause.text = self.library[self.song_index][1]
+
+    # def change_song(self, instance):
+    #     if instance.text == "|<<":
+    #         self.song_index = self.song_index - 1 if self.song_index > 0 else self.song_count
+    #     elif instance.text == ">>|":
+    #         self.song_index = self.song_index + 1 if self.song_index < self.song_count else 0
+
+    #     self.sound.stop()
+    #     self.sound = self.library[self.song_index][0]
+    #     self.sound.play()
+    #     self.play_pause.text = self.library[self.song_index][1]
+
+
+class MyLayout(FloatLayout):
+    def __init__(self, **kwargs):
+        super(MyLayout, self).__init__(**kwargs)
+        self.painter = Painter()
+        self.interface = Interface()
+        self.options_menu = Popup(title="Options Menu",
+                                  content=OptionsMenu(),
+                                  size_hint=(.75, .75))
+
+        self.painter.reset()
+        self.interface.run_button.bind(on_press=self.toggle_automaton)
+        self.interface.replay_button.bind(on_press=self.restart)
+        self.interface.options_button.bind(on_press=self.options_menu.open)
+        self.interface.dropdown.bind(on_select=self.toggle_options)
+        self.options_menu.content.profile_button.bind(on_press=self.toggle_profiler)
+        self.options_menu.content.export_button.bind(on_press=self.export_profile)
+        self.options_menu.content.detail_button.bind(on_press=self.toggle_detail)
+        self.overlay = ProfileOverlay(pos_hint={"x": 0.02, "y": 0.67}, size_hint=(0.96, 0.1), font_size=16,
+                                      halign="left", valign="middle")
+        self.cycle_label = Label(pos_hint={"x": 0.02, "y": 0.64}, size_hint=(0.96, 0.05), font_size=20)
+        self.event_loop = Clock.schedule_interval(
+            self.painter.update, self.get_update_rate())
+
+        self.add_widget(self.painter)
+        self.add_widget(self.interface)
+
+    def get_update_rate(self):
+        return 1 / int(self.options_menu.content.frame_input.text)
+
+    def toggle_profiler(self, instance):
+        if self.painter.profiler is None:
+            self.painter.profiler = FrameProfiler(self.get_update_rate())
+            self.painter.profiler.hooks.append(self.overlay.show)
+            self.add_widget(self.overlay)
+            instance.text = "Profiler: On"
+        else:
+            self.painter.profiler = None
+            self.overlay.text = ""
+            self.remove_widget(self.overlay)
+            instance.text = "Profiler: Off"
+        self.options_menu.content.export_button.disabled = self.painter.profiler is None
+
+    def export_profile(self, _):
+        if self.painter.profiler is not None:
+            self.painter.profiler.save("frame_profile.json")
+
+    def toggle_detail(self, instance):
+        # a block of cells shows its highest state, or the cell in its corner which only reads one cell per pixel
+        self.painter.detail = "sample" if self.painter.detail == "max" else "max"
+        instance.text = "Zoomed Out: " + self.painter.detail.capitalize()
+        if self.painter.view is not None:
+            self.painter.redraw()
+
+    def stop_stepper(self):
+        if self.painter.stepper is not None:
+            self.painter.stepper.stop()
+            self.painter.stepper = None
+
+    def found_cycle(self, detector):
+        # may come from the stepper thread, so the widgets are left to the clock
+        def show(_):
+            self.cycle_label.text = f"Period {detector.period} cycle from generation {detector.start}"
+            if self.cycle_label.parent is None:
+                self.add_widget(self.cycle_label)
+            if detector.mode == "pause" and self.painter.play:
+                self.toggle_automaton(self.interface.run_button)
+        Clock.schedule_once(show)
+
+    def restart(self, _):
+        self.stop_stepper()
+        if self.cycle_label.parent is not None:
+            self.remove_widget(self.cycle_label)
+        self.painter.play = False
+        self.painter.system = self.interface.main_button.text
+        self.painter.reset()
+        self.interface.run_button.text = "Generate"
+        self.interface.replay_button.disabled = True
+        self.interface.main_button.disabled = False
+
+    def toggle_automaton(self, instance):
+        self.event_loop.cancel()
+        self.event_loop = Clock.schedule_interval(
+            self.painter.update, self.get_update_rate())
+        if self.painter.profiler is not None:
+            self.painter.profiler.interval = self.get_update_rate()
+
+        if instance.text == "Generate":
+            self.interface.replay_button.disabled = False
+            x = int(self.options_menu.content.dims_input.text)
+            dims = (x, x)
+            boundary = self.options_menu.content.boundary
+
+            if self.painter.system in ("Game of Life", "Brian's Brain", "Sand Piles"):
+                randoms = int(self.interface.input1.text)
+                if self.painter.system == "Sand Piles":
+                    self.painter.system = create("SandPiles", dims, randoms)
+                elif self.painter.system == "Game of Life":
+                    self.painter.system = create("GameOfLife", dims, randoms, boundary=boundary)
+                else:
+                    self.painter.system = create("BriansBrain", dims, randoms, boundary=boundary)
+
+            elif self.painter.system == "Rock Paper Scissors":
+                health = int(self.interface.input1.text)
+                randoms = int(self.interface.input2.text)
+                try:
+                    self.painter.system = RockPaperScissors(dims, health, randoms, boundary=boundary)
+                except ValueError:
+                    self.interface.input1.foreground_color = (1, 0, 0, 1)
+                    return
+
+            elif self.painter.system == "Life-like":
+                randoms = int(self.interface.input2.text)
+                try:
+                    self.painter.system = LifeLike(dims, self.interface.input1.text, randoms, boundary=boundary)
+                except ValueError:
+                    self.interface.input1.foreground_color = (1, 0, 0, 1)
+                    return
+
+            elif self.painter.system == "Elementary":
+                rule = int(self.interface.input1.text)
+                seed = int(self.interface.input2.text)
+                self.painter.system = create("Elementary", dims, rule, seed)
+
+            elif self.painter.system == "HashLife":
+                randoms = int(self.interface.input1.text)
+                jump = int(self.interface.input2.text)
+                self.painter.system = HashLife(dims, randoms, 2 ** jump)
+
+            elif self.painter.system in ("Langton's Ant", "Turmites"):
+                rule = int(self.interface.input1.text)
+                step = int(self.interface.input2.text)
+                agents = int(self.interface.input3.text or 1)
+                ant = self.painter.system == "Langton's Ant"
+                if agents > 1:
+                    colony = AntColony if ant else TurmiteColony
+                    self.painter.system = colony(dims, rule, step, agents, boundary)
+                elif ant:
+                    self.painter.system = LangtonsAnt(dims, rule, step)
+                else:
+                    self.painter.system = Turmites(dims, rule, step)
+
+            elif self.painter.system in ("Unbounded Ant", "Unbounded Turmite"):
+                rule = int(self.interface.input1.text)
+                step = int(self.interface.input2.text)
+                walker = UnboundedAnt if self.painter.system == "Unbounded Ant" else UnboundedTurmite
+                self.painter.system = walker(dims, rule, step)
+
+            cycles = self.options_menu.content.cycles
+            if cycles != "off" and not isinstance(self.painter.system, str):
+                self.painter.system = CycleDetector(self.painter.system, mode=cycles)
+                self.painter.system.hooks.append(self.found_cycle)
+            self.painter.initialize()
+            self.stop_stepper()
+            if self.options_menu.content.background_button.text.endswith("On"):
+                self.painter.stepper = Stepper(self.painter.system, int(self.options_menu.content.rate_input.text or 0))
+                self.painter.latest()
+            instance.text = "Play"
+
+        else:
+            if not self.painter.play:
+                self.painter.play = True
+                if self.painter.stepper is not None:
+                    self.painter.stepper.play()
+                self.interface.main_button.disabled = True
+                instance.text = "Pause"
+            else:
+                self.painter.play = False
+                if self.painter.stepper is not None:
+                    self.painter.stepper.pause()
+                self.interface.main_button.disabled = False
+                instance.text = "Resume"
+
+    def toggle_options(self, _, selection):
+        self.interface.main_button.text = selection
+        if self.interface.run_button.disabled:
+            self.interface.run_button.disabled = False
+        else:
+            self.restart(None)
+
+        unwanted = self.interface.children[:-self.interface.interface_count]
+        for child in unwanted:
+            self.interface.remove_widget(child)
+
+        size = 45
+        if selection in ("Game of Life", "Brian's Brain", "Sand Piles"):
+            self.interface.add_widget(Label(text="Random:", pos_hint={"x": 0.06, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.input1 = NumericInput(pos_hint={"x": 0.44, "y": 0.8}, size_hint=(0.3, 0.055), text='10',
+                                                 font_size=size, font_name=font_family)
+            self.interface.add_widget(self.interface.input1)
+
+        elif selection == "Rock Paper Scissors":
+            self.interface.add_widget(Label(text="Health:", pos_hint={"x": 0.04, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.add_widget(Label(text="Random:", pos_hint={"x": 0.51, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.input1 = NumericInput(pos_hint={"x": 0.25, "y": 0.8}, size_hint=(0.22, 0.055), text='10',
+                                                 font_size=size, font_name=font_family)
+            self.interface.input1.bind(text=lambda ob, _: setattr(ob, "foreground_color", (0, 0, 0, 1)))
+            self.interface.input2 = NumericInput(pos_hint={"x": 0.75, "y": 0.8}, size_hint=(0.22, 0.055), text='20',
+                                                 font_size=size, font_name=font_family)
+            self.interface.add_widget(self.interface.input1)
+            self.interface.add_widget(self.interface.input2)
+
+        elif selection == "Life-like":
+            self.interface.add_widget(Label(text="Rule:", pos_hint={"x": 0.02, "y": 0.8}, size_hint=(0.15, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.add_widget(Label(text="Random:", pos_hint={"x": 0.51, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            # B/S or B/S/C rule strings, or a name from life_rules like HighLife
+            self.interface.input1 = TextInput(pos_hint={"x": 0.18, "y": 0.8}, size_hint=(0.31, 0.055), text='B36/S23',
+                                              font_size=size * 0.8, font_name=font_family, multiline=False)
+            self.interface.input1.bind(text=lambda ob, _: setattr(ob, "foreground_color", (0, 0, 0, 1)))
+            self.interface.input2 = NumericInput(pos_hint={"x": 0.75, "y": 0.8}, size_hint=(0.22, 0.055), text='2000',
+                                                 font_size=size, font_name=font_family)
+            self.interface.add_widget(self.interface.input1)
+            self.interface.add_widget(self.interface.input2)
+
+        elif selection == "Elementary":
+            self.interface.add_widget(Label(text="Rule Set:", pos_hint={"x": 0.04, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.add_widget(Label(text="Seed:", pos_hint={"x": 0.56, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.input1 = NumericInput(pos_hint={"x": 0.27, "y": 0.8}, size_hint=(0.22, 0.055), text='90',
+                                                 font_size=size, font_name=font_family)
+            self.interface.input2 = NumericInput(pos_hint={"x": 0.75, "y": 0.8}, size_hint=(0.22, 0.055), text='0',
+                                                 font_size=size, font_name=font_family)
+            self.interface.add_widget(self.interface.input1)
+            self.interface.add_widget(self.interface.input2)
+
+        elif selection == "HashLife":
+            self.interface.add_widget(Label(text="Random:", pos_hint={"x": 0.04, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.add_widget(Label(text="Jump:", pos_hint={"x": 0.55, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.input1 = NumericInput(pos_hint={"x": 0.25, "y": 0.8}, size_hint=(0.22, 0.055), text='500',
+                                                 font_size=size, font_name=font_family)
+            self.interface.input2 = NumericInput(pos_hint={"x": 0.75, "y": 0.8}, size_hint=(0.22, 0.055), text='0',
+                                                 font_size=size, font_name=font_family)
+            self.interface.add_widget(self.interface.input1)
+            self.interface.add_widget(self.interface.input2)
+
+        elif selection in ("Langton's Ant", "Turmites", "Unbounded Ant", "Unbounded Turmite"):
+            self.interface.add_widget(Label(text="Config:", pos_hint={"x": 0.04, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.add_widget(Label(text="Steps:", pos_hint={"x": 0.55, "y": 0.8}, size_hint=(0.2, 0.06),
+                                            font_size=size, font_name=font_family, halign="justify", valign="bottom"))
+            self.interface.input1 = NumericInput(pos_hint={"x": 0.25, "y": 0.8}, size_hint=(0.22, 0.055), text='0',
+                                                 font_size=size, font_name=font_family)
+            self.interface.input2 = NumericInput(pos_hint={"x": 0.75, "y": 0.8}, size_hint=(0.22, 0.055), text='50',
+                                                 font_size=size, font_name=font_family)
+            self.interface.add_widget(self.interface.input1)
+            self.interface.add_widget(self.interface.input2)
+            if not selection.startswith("Unbounded"):
+                # more than one agent makes a colony, stepped all at once and kept on the grid by the boundary
+                self.interface.add_widget(Label(text="Agents:", pos_hint={"x": 0.04, "y": 0.72},
+                                                size_hint=(0.2, 0.06), font_size=size, font_name=font_family,
+                                                halign="justify", valign="bottom"))
+                self.interface.input3 = NumericInput(pos_hint={"x": 0.25, "y": 0.72}, size_hint=(0.22, 0.055),
+                                                     text='1', font_size=size, font_name=font_family)
+                self.interface.add_widget(self.interface.input3)
+
+        self.painter.system = selection
+
+
+class MainApp(App):
+    def build(self):
+        return MyLayout()
+
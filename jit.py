@@ -0,0 +1,165 @@
+from numba import njit
+from automata import NumpyGameOfLife, SandPiles, changed_cells
+import numpy as np
+
+edges = {"dead": 0, "toroidal": 1, "reflective": 2}
+
+
+@njit(cache=True)
+def life_rows(cells, out, first, last, edge):
+    h, w = cells.shape
+    # column sums of the three rows around a cell, with a ghost column either side
+    sums = np.zeros(w + 2, dtype=np.int32)
+    for i in range(first, last):
+        # past an edge a dead boundary reads nothing, a toroidal one the far side and a reflective one the edge itself
+        above, below = i - 1, i + 1
+        if edge == 1:
+            above, below = above % h, below % h
+        elif edge == 2:
+            above, below = max(above, 0), min(below, h - 1)
+        for j in range(w):
+            sums[j + 1] = cells[i, j]
+        if 0 <= above:
+            for j in range(w):
+                sums[j + 1] += cells[above, j]
+        if below < h:
+            for j in range(w):
+                sums[j + 1] += cells[below, j]
+        if edge == 1:
+            sums[0], sums[w + 1] = sums[w], sums[1]
+        elif edge == 2:
+            sums[0], sums[w + 1] = sums[1], sums[w]
+        for j in range(w):
+            count = sums[j] + sums[j + 1] + sums[j + 2]
+            # the count takes in the cell itself, so 3 is a birth or a survival and 4 only a survival; bitwise
+            # rather than short circuit, so there is no branch to mispredict on a busy grid
+            out[i, j] = (count == 3) | ((count == 4) & (cells[i, j] == 1))
+
+
+class JitGameOfLife(NumpyGameOfLife):
+    @staticmethod
+    def step_rows(first, last, cells, out, boundary):
+        life_rows(cells, out, first, last, edges[boundary])
+        changes = changed_cells(cells[first:last], out[first:last])
+        changes[:, 0] += first
+        return changes
+
+
+@njit(cache=True)
+def topple_cells(padded, odometer):
+    # the same sweeps as topple_grid, each toppling every unstable cell at once, but visiting only the cells that were
+    # unstable or next to one that toppled, as few are once a pile starts from a close guess at its odometer
+    h, w = odometer.shape
+    cells, after = np.empty((h * w, 2), dtype=np.int64), np.empty((h * w, 2), dtype=np.int64)
+    grains = np.empty(h * w, dtype=padded.dtype)
+    seen = np.zeros((h + 2, w + 2), dtype=np.int64)
+    count = 0
+    for i in range(1, h + 1):
+        for j in range(1, w + 1):
+            if padded[i, j] >= 4:
+                cells[count, 0], cells[count, 1] = i, j
+                count += 1
+    sweeps = 0
+    while count:
+        sweeps += 1
+        for k in range(count):
+            i, j = cells[k, 0], cells[k, 1]
+            grains[k] = padded[i, j] >> 2
+        for k in range(count):
+            i, j = cells[k, 0], cells[k, 1]
+            odometer[i - 1, j - 1] += grains[k]
+            padded[i, j] -= 4 * grains[k]
+            # grains that fall off the edge land on the ghost border, which is never read
+            padded[i - 1, j] += grains[k]
+            padded[i + 1, j] += grains[k]
+            padded[i, j - 1] += grains[k]
+            padded[i, j + 1] += grains[k]
+        # the next sweep's cells are among these and their neighbours, each taken once
+        last = count
+        count = 0
+        for k in range(last):
+            i, j = cells[k, 0], cells[k, 1]
+            for y, x in ((i, j), (i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                if 0 < y <= h and 0 < x <= w and seen[y, x] != sweeps and padded[y, x] >= 4:
+                    seen[y, x] = sweeps
+                    after[count, 0], after[count, 1] = y, x
+                    count += 1
+        cells, after = after, cells
+    padded[0, :] = padded[-1, :] = 0
+    padded[:, 0] = padded[:, -1] = 0
+    return sweeps
+
+
+@njit(cache=True)
+def neighbours(inside, i, j):
+    return inside[i - 1, j] + inside[i + 1, j] + inside[i, j - 1] + inside[i, j + 1]
+
+
+@njit(cache=True)
+def untopple_cells(padded, odometer, inside, cells, count):
+    # peels the listed cells down to the largest set of them that could all topple once less, untopples that set and
+    # lists it for the next call; removals only ever free more cells, so the order of the peeling does not matter
+    stack = np.empty((count, 2), dtype=np.int64)
+    top = 0
+    for k in range(count):
+        i, j = cells[k, 0], cells[k, 1]
+        if padded[i, j] >= neighbours(inside, i, j):
+            stack[top, 0], stack[top, 1] = i, j
+            top += 1
+    for k in range(top):
+        inside[stack[k, 0], stack[k, 1]] = 0
+    while top:
+        top -= 1
+        i, j = stack[top, 0], stack[top, 1]
+        for y, x in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if inside[y, x] and padded[y, x] >= neighbours(inside, y, x):
+                inside[y, x] = 0
+                stack[top, 0], stack[top, 1] = y, x
+                top += 1
+    kept = 0
+    for k in range(count):
+        i, j = cells[k, 0], cells[k, 1]
+        if inside[i, j]:
+            cells[kept, 0], cells[kept, 1] = i, j
+            kept += 1
+    for k in range(kept):
+        i, j = cells[k, 0], cells[k, 1]
+        odometer[i - 1, j - 1] -= 1
+        padded[i, j] += 4
+        padded[i - 1, j] -= 1
+        padded[i + 1, j] -= 1
+        padded[i, j - 1] -= 1
+        padded[i, j + 1] -= 1
+    padded[0, :] = padded[-1, :] = 0
+    padded[:, 0] = padded[:, -1] = 0
+    # a cell that has given back its last toppling can give back no more
+    count = 0
+    for k in range(kept):
+        i, j = cells[k, 0], cells[k, 1]
+        inside[i, j] = odometer[i - 1, j - 1] > 0
+        if inside[i, j]:
+            cells[count, 0], cells[count, 1] = i, j
+            count += 1
+    return kept, count
+
+
+class JitSandPiles(SandPiles):
+    # giving back a toppling only visits the cells still to give one back, so the guess is taken as it is
+    margin = 0
+
+    @staticmethod
+    def settle(padded, odometer):
+        sweeps = topple_cells(padded, odometer)
+        # giving back topplings leaves the pile stable, so it never has to topple again; each set given back is looked
+        # for among the last one's cells, and only when none is left there among every cell that toppled
+        full = True
+        while True:
+            if full:
+                inside = np.zeros(padded.shape, dtype=np.int8)
+                inside[1:-1, 1:-1] = odometer > 0
+                cells = np.argwhere(inside)
+                count = len(cells)
+            kept, count = untopple_cells(padded, odometer, inside, cells, count)
+            if not kept and full:
+                return sweeps
+            full = not kept
@@ -0,0 +1,58 @@
+import json
+import numpy as np
+
+
+class FrameProfiler:
+    fields = ("update", "draw", "changes", "instructions", "late")
+
+    def __init__(self, interval=0, window=600):
+        self.interval = interval  # seconds between scheduled frames, 0 to skip deadline checks
+        self.window = window
+        self.samples = np.zeros((window, len(self.fields)))
+        self.frames = 0
+        self.missed = 0
+        self.refreshes = []
+        self.hooks = []
+
+    def record(self, update, draw, changes, instructions, dt):
+        # the clock hands each frame the time since the last one, so a long gap means frames were dropped
+        late = bool(self.interval) and dt > 1.5 * self.interval
+        self.samples[self.frames % self.window] = update, draw, changes, instructions, late
+        self.frames += 1
+        self.missed += late
+        if self.hooks:
+            sample = dict(zip(self.fields, (update, draw, changes, instructions, late)))
+            for hook in self.hooks:
+                hook(self, sample)
+
+    def refreshed(self, seconds):
+        self.refreshes = (self.refreshes + [seconds])[-self.window:]
+
+    def recent(self):
+        if self.frames < self.window:
+            return self.samples[:self.frames]
+        # oldest first
+        return np.roll(self.samples, -(self.frames % self.window), axis=0)
+
+    def summary(self):
+        recent = self.recent()
+        if not len(recent):
+            return {}
+        return {field: {"mean": float(column.mean()), "p95": float(np.percentile(column, 95)),
+                        "max": float(column.max())} for field, column in zip(self.fields, recent.T)}
+
+    def histograms(self, bins=20):
+        recent = self.recent()
+        histograms = {}
+        for field, column in zip(self.fields, recent.T):
+            counts, edges = np.histogram(column, bins=bins)
+            histograms[field] = {"counts": counts.tolist(), "edges": edges.tolist()}
+        if self.refreshes:
+            counts, edges = np.histogram(self.refreshes, bins=bins)
+            histograms["refresh"] = {"counts": counts.tolist(), "edges": edges.tolist()}
+        return histograms
+
+    def save(self, path, bins=20):
+        with open(path, "w") as file:
+            json.dump({"frames": self.frames, "missed": self.missed, "interval": self.interval,
+                       "summary": self.summary(), "histograms": self.histograms(bins)}, file, indent=1)
@@ -0,0 +1,134 @@
+from threading import Event, Lock, Thread
+from time import perf_counter, sleep
+import numpy as np
+
+
+class Frame:
+    # a finished generation copied out of the automaton, so it can be drawn while the next one is being stepped
+    def __init__(self, system):
+        self.dims, self.color_rules = system.dims, system.color_rules
+        matrix = system.matrix
+        self.matrix = np.array(matrix) if isinstance(matrix, list) else matrix.copy()
+        self.scroll = getattr(system, "scroll", 0)
+        self.changes, self.busy = None, 0.0  # changes since the last frame, None when all of it is new
+
+    def color(self, i, j):
+        # every automaton shades the states past its last colour like the last one
+        return self.color_rules[min(int(self.matrix[i, j]), max(self.color_rules))]
+
+
+class Stepper:
+    def __init__(self, system, rate=0):
+        self.system = system
+        self.rate = rate  # generations per second, 0 to step as fast as possible
+        self.lock = Lock()  # held while the automaton is stepped or changed
+        self.handover = Lock()  # held only to hand a frame over, so the painter never waits for a generation
+        self.running = Event()
+        self.stopped = False
+        self.generations = 0
+        self.pending, self.count, self.full, self.busy = [], 0, True, 0.0
+        self.calls = []
+        self.frame, self.stale = None, False
+        with self.lock:
+            self.publish()
+        self.thread = Thread(target=self.loop, daemon=True)
+        self.thread.start()
+
+    def loop(self):
+        cells = self.system.dims[0] * self.system.dims[1]
+        deadline = perf_counter()
+        while not self.stopped:
+            if self.calls:
+                with self.lock:
+                    self.run_calls()
+            if not self.running.wait(0.1):
+                # the generation that was on when the stepper paused is shown even if the last frame is not taken
+                if self.stale:
+                    with self.lock:
+                        self.publish(latest=True)
+                deadline = perf_counter()
+                continue
+            if self.stopped:
+                break
+            with self.lock:
+                start = perf_counter()
+                self.system.update()
+                self.busy += perf_counter() - start
+                self.generations += 1
+                # keep every generation's changes until the next frame takes them, unless they add up to
+                # more than the grid, when redrawing everything is cheaper
+                if not self.full:
+                    self.count += len(self.system.changes)
+                    if self.count > cells:
+                        self.full, self.pending = True, []
+                    else:
+                        self.pending.append(self.system.changes.copy())
+                self.stale = True
+                self.publish()
+            if self.rate:
+                # a late generation pushes the schedule back rather than letting the next ones bunch up
+                deadline = max(deadline + 1 / self.rate, perf_counter())
+                sleep(max(deadline - perf_counter(), 0))
+            else:
+                sleep(0)
+
+    def run_calls(self):
+        # call with the lock held; whatever the calls change is redrawn whole
+        with self.handover:
+            calls, self.calls = self.calls, []
+        for call in calls:
+            call()
+        self.full, self.pending = True, []
+        self.publish(latest=True)
+
+    def call(self, function):
+        # changes the automaton between generations: straight away if the stepper is idle, or else once the
+        # generation it is on has finished
+        with self.handover:
+            self.calls.append(function)
+        if self.lock.acquire(blocking=False):
+            try:
+                self.run_calls()
+            finally:
+                self.lock.release()
+
+    def publish(self, latest=False):
+        # call with the lock held; a frame is only copied once the last one has been taken, unless the latest
+        # generation has to be shown anyway, when it replaces the waiting frame and takes over its changes
+        if self.frame is not None and not latest:
+            return
+        frame = Frame(self.system)
+        with self.handover:
+            waiting, self.frame = self.frame, frame
+            if waiting is not None:
+                self.busy += waiting.busy
+                if waiting.changes is None:
+                    self.full, self.pending = True, []
+                elif not self.full:
+                    self.pending.insert(0, waiting.changes)
+            if not self.full:
+                frame.changes = set()
+                if self.pending and isinstance(self.pending[0], np.ndarray):
+                    frame.changes = np.concatenate(self.pending)
+                elif self.pending:
+                    frame.changes = set().union(*self.pending)
+            frame.busy = self.busy
+            self.pending, self.count, self.full, self.busy = [], 0, False, 0.0
+        self.stale = False
+
+    def take(self):
+        # the newest finished generation not yet drawn, or None when there is none
+        with self.handover:
+            frame, self.frame = self.frame, None
+        return frame
+
+    def play(self):
+        self.running.set()
+
+    def pause(self):
+        self.running.clear()
+
+    def stop(self):
+        self.stopped = True
+        self.running.set()
+        self.thread.join()
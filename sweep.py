@@ -0,0 +1,193 @@
+from itertools import product
+from multiprocessing import Pool
+from time import perf_counter
+from automata import Checkpoint
+from cycles import CycleDetector
+import json
+import numpy as np
+import os
+import random
+
+# one file per column; ragged columns, whose rows differ in length, keep the end offset of every row in another file
+schema = (("automaton", "|u1", True), ("params", "|u1", True), ("seed", "<i8", False), ("width", "<i8", False),
+          ("height", "<i8", False), ("steps", "<i8", False), ("generations", "<i8", False),
+          ("seconds", "<f8", False), ("final_population", "<i8", False), ("final_density", "<f8", False),
+          ("mean_population", "<f8", False), ("period", "<i8", False), ("cycle_start", "<i8", False),
+          ("avalanches", "<i8", False), ("largest_avalanche", "<i8", False), ("population", "<i8", True),
+          ("avalanche_sizes", "<i8", True))
+text = {"automaton", "params"}
+
+
+def argument(value, dims):
+    # a percentage seeds that share of the cells, so one sweep covers the same densities at every size
+    if isinstance(value, str) and value.endswith("%"):
+        return int(float(value[:-1]) * dims[0] * dims[1] / 100)
+    return value
+
+
+def avalanche_sizes(activity):
+    # an avalanche is a run of generations that change something, measured in changed cells
+    sizes, size = [], 0
+    for count in activity:
+        if count:
+            size += count
+        elif size:
+            sizes.append(size)
+            size = 0
+    if size:
+        sizes.append(size)
+    return sizes
+
+
+def population(system):
+    return int(np.count_nonzero(np.asarray(system.matrix)))
+
+
+def run_job(job):
+    name, params, seed, dims, steps, window = job
+    # every job seeds its own generators, so its result does not depend on the worker or the order it ran in
+    random.seed(seed)
+    np.random.seed(seed)
+    start = perf_counter()
+    system = Checkpoint.kinds[name](dims, *[argument(value, dims) for value in params])
+    detector = CycleDetector(system, window)
+    counts, activity = [population(system)], []
+    # a run that has settled into a cycle would only repeat itself, and an ant off the grid does nothing more
+    while len(activity) < steps and detector.period is None and getattr(system, "safe", True):
+        detector.update()
+        activity.append(len(system.changes))
+        counts.append(population(system))
+    sizes = avalanche_sizes(activity)
+    return {"automaton": name, "params": json.dumps(params), "seed": seed, "width": dims[0], "height": dims[1],
+            "steps": steps, "generations": len(activity), "seconds": perf_counter() - start,
+            "final_population": counts[-1], "final_density": counts[-1] / (dims[0] * dims[1]),
+            "mean_population": float(np.mean(counts)),
+            "period": -1 if detector.period is None else detector.period,
+            "cycle_start": -1 if detector.start is None else detector.start,
+            "avalanches": len(sizes), "largest_avalanche": max(sizes, default=0), "population": counts,
+            "avalanche_sizes": sizes}
+
+
+def job_key(automaton, params, seed, width, height, steps):
+    return automaton, params, seed, width, height, steps
+
+
+class ColumnFile:
+    def __init__(self, path):
+        self.path = path
+        layout = {name: {"dtype": dtype, "ragged": ragged} for name, dtype, ragged in schema}
+        os.makedirs(path, exist_ok=True)
+        header = os.path.join(path, "columns.json")
+        if os.path.exists(header):
+            with open(header) as file:
+                if json.load(file) != layout:
+                    raise ValueError(f"{path} holds columns that do not match this version of the sweep")
+        else:
+            with open(header, "w") as file:
+                json.dump(layout, file, indent=1)
+        self.rows, self.ends = self.recover(), {}
+        self.files = {}
+        for name, dtype, ragged in schema:
+            self.files[name] = open(self.column(name), "ab")
+            if ragged:
+                self.files[name + ".offsets"] = open(self.column(name) + ".offsets", "ab")
+                self.ends[name] = self.end(name, self.rows)
+
+    def column(self, name):
+        return os.path.join(self.path, name + ".bin")
+
+    def end(self, name, rows):
+        if not rows:
+            return 0
+        return int(np.fromfile(self.column(name) + ".offsets", dtype="<i8", count=1, offset=(rows - 1) * 8)[0])
+
+    def recover(self):
+        # a run stopped halfway through a row leaves some columns a row longer than others, so cut them all back
+        # to the rows every column has
+        counts = []
+        for name, dtype, ragged in schema:
+            path = self.column(name) + ".offsets" if ragged else self.column(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            counts.append(size // (8 if ragged else np.dtype(dtype).itemsize))
+        rows = min(counts)
+        for name, dtype, ragged in schema:
+            if ragged:
+                for path, size in ((self.column(name) + ".offsets", rows * 8),
+                                   (self.column(name), self.end(name, rows) * np.dtype(dtype).itemsize)):
+                    with open(path, "ab") as file:
+                        file.truncate(size)
+            else:
+                with open(self.column(name), "ab") as file:
+                    file.truncate(rows * np.dtype(dtype).itemsize)
+        return rows
+
+    def append(self, row):
+        for name, dtype, ragged in schema:
+            value = row[name].encode() if name in text else row[name]
+            values = np.frombuffer(value, dtype=dtype) if name in text else np.asarray(value, dtype=dtype)
+            self.files[name].write(values.tobytes())
+            if ragged:
+                self.ends[name] += values.size
+                self.files[name + ".offsets"].write(np.int64(self.ends[name]).tobytes())
+        for file in self.files.values():
+            file.flush()
+        self.rows += 1
+
+    def close(self):
+        for file in self.files.values():
+            file.close()
+
+
+def read_columns(path):
+    columns = {}
+    with open(os.path.join(path, "columns.json")) as file:
+        layout = json.load(file)
+    rows = None
+    for name, spec in layout.items():
+        values = np.fromfile(os.path.join(path, name + ".bin"), dtype=spec["dtype"])
+        if spec["ragged"]:
+            ends = np.fromfile(os.path.join(path, name + ".bin.offsets"), dtype="<i8")
+            values = np.split(values, ends[:-1]) if len(ends) else []
+            if name in text:
+                values = [value.tobytes().decode() for value in values]
+        columns[name] = values
+        rows = len(values) if rows is None else min(rows, len(values))
+    # columns are written one after another, so a sweep still running can be a row ahead in some of them
+    return {name: values[:rows] for name, values in columns.items()}
+
+
+def done_jobs(path):
+    if not os.path.exists(os.path.join(path, "columns.json")):
+        return set()
+    columns = read_columns(path)
+    return set(zip(*(columns[name] if name in text else columns[name].tolist() for name in
+                     ("automaton", "params", "seed", "width", "height", "steps"))))
+
+
+def plan(automaton, values, seeds, dims, steps, window):
+    return [(automaton, list(params), seed, dims, steps, window) for params in product(*values) for seed in seeds]
+
+
+def main(args):
+    dims = (args.size, args.height or args.size)
+    jobs = plan(args.automaton, args.params, args.seeds, dims, args.generations, args.window)
+    done = done_jobs(args.output)
+    pending = [job for job in jobs if job_key(job[0], json.dumps(job[1]), job[2], *job[3], job[4]) not in done]
+    print(f"{len(jobs) - len(pending)} of {len(jobs)} jobs already in {args.output}")
+    output = ColumnFile(args.output)
+    pool = Pool(args.processes) if args.processes > 1 else None
+    start = perf_counter()
+    try:
+        results = pool.imap_unordered(run_job, pending) if pool else map(run_job, pending)
+        for count, row in enumerate(results, 1):
+            # rows go out as jobs finish, so an interrupted sweep keeps everything it has finished
+            output.append(row)
+            period = row["period"] if row["period"] > 0 else "-"
+            print(f"{count:6}/{len(pending)}  {row['automaton']} {' '.join(map(str, json.loads(row['params'])))} "
+                  f"seed {row['seed']}: {row['generations']} generations, density {row['final_density']:.3f}, "
+                  f"period {period}, {row['seconds']:.2f}s")
+    finally:
+        if pool:
+            pool.terminate()
+        output.close()
+    print(f"{len(pending)} jobs in {perf_counter() - start:.2f}s")